@@ -3344,4 +3344,7 @@ def get_priority_queue():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    if ENRICHMENT_AVAILABLE:
+        from enrichment.search_engine import install_fast_event_loop
+        install_fast_event_loop()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -46,7 +46,8 @@ DATA_FOLDERS = [
 
 # Learning System Configuration
 LEARNING_CONFIG = {
-    'events_file': 'data/learning/learning_events.json',
+    'events_file': 'data/learning/learning_events.json',  # legacy, imported into events_db
+    'events_db': 'data/learning/learning_events.db',
     'patterns_file': 'data/learning/domain_patterns.json',
     'knowledge_base_file': 'data/learning/knowledge_base.json',
     'confidence_threshold': 0.7,
@@ -6,17 +6,37 @@ Continuously improves accuracy through user feedback and pattern recognition
 
 import json
 import os
+import heapq
 import re
+import sqlite3
+import threading
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from collections import defaultdict, Counter
 import pickle
 import numpy as np
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 logger = logging.getLogger(__name__)
 
+_INSERT_EVENT_SQL = 'INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+
+class _EventsStore:
+    """A learning events database connection shared by every open system using that file"""
+    
+    def __init__(self, path: str, conn: sqlite3.Connection):
+        self.path = path
+        self.conn = conn
+        self.lock = threading.Lock()  # serializes use of the shared connection
+        self.users = 0
+
+
+# Learning events databases opened in this process, by absolute path
+_events_stores: Dict[str, _EventsStore] = {}
+_events_stores_lock = threading.Lock()
+
 @dataclass
 class LearningEvent:
     """Represents a learning event from user feedback or system observation"""
@@ -28,6 +48,7 @@ class LearningEvent:
     user_action: str  # 'verified', 'rejected', 'flagged', 'successful_search'
     features: Dict[str, Any]  # Features that led to the prediction
     metadata: Dict[str, Any] = None
+    rowid: Optional[int] = field(default=None, compare=False, repr=False)  # events table row once saved
 
 @dataclass
 class DomainPattern:
@@ -71,7 +92,8 @@ class AgenticLearningSystem:
         os.makedirs(data_dir, exist_ok=True)
         
         # Learning data files
-        self.events_file = os.path.join(data_dir, 'learning_events.json')
+        self.events_file = os.path.join(data_dir, 'learning_events.json')  # legacy, imported into an empty events_db
+        self.events_db = os.path.join(data_dir, 'learning_events.db')
         self.patterns_file = os.path.join(data_dir, 'domain_patterns.json')
         self.knowledge_file = os.path.join(data_dir, 'knowledge_base.json')
         self.model_file = os.path.join(data_dir, 'confidence_model.pkl')
@@ -79,6 +101,7 @@ class AgenticLearningSystem:
         self.relevance_patterns_file = os.path.join(data_dir, 'relevance_patterns.json')
         
         # Load existing data
+        self._store: Optional[_EventsStore] = None
         self.learning_events = self._load_learning_events()
         self.domain_patterns = self._load_domain_patterns()
         self.knowledge_base = self._load_knowledge_base()
@@ -546,13 +569,13 @@ class AgenticLearningSystem:
         verified_events = sum(1 for e in self.learning_events if e.user_action == 'verified')
         rejected_events = sum(1 for e in self.learning_events if e.user_action == 'rejected')
         
-        # Top patterns by success rate
-        top_patterns = sorted(
-            [(k, v) for k, v in self.domain_patterns.items() 
-             if v.sample_count >= self.min_samples_for_pattern],
-            key=lambda x: x[1].success_rate,
-            reverse=True
-        )[:10]
+        # Top patterns by success rate (only the best 5 are reported)
+        top_patterns = heapq.nlargest(
+            5,
+            ((k, v) for k, v in self.domain_patterns.items()
+             if v.sample_count >= self.min_samples_for_pattern),
+            key=lambda x: x[1].success_rate
+        )
         
         # Recent learning trends
         recent_events = [
@@ -575,7 +598,7 @@ class AgenticLearningSystem:
                     'sample_count': p[1].sample_count,
                     'confidence_boost': p[1].confidence_boost
                 }
-                for p in top_patterns[:5]
+                for p in top_patterns
             ],
             'recent_activity': len(recent_events),
             'knowledge_base_size': sum(len(v) if isinstance(v, list) else 1 
@@ -911,23 +934,112 @@ class AgenticLearningSystem:
         brand_pattern['last_interaction'] = datetime.now().isoformat()
     
     # Data persistence methods
+    def _events_store(self) -> _EventsStore:
+        """The shared events database connection, opened on first use and kept until close()"""
+        if self._store is None:
+            path = os.path.abspath(self.events_db)
+            with _events_stores_lock:
+                store = _events_stores.get(path)
+                if store is None:
+                    store = _events_stores[path] = _EventsStore(path, self._open_events_db(path))
+                store.users += 1
+            self._store = store
+        return self._store
+    
+    def close(self):
+        """Release the events database; the connection closes when no open system still uses it"""
+        store, self._store = self._store, None
+        if store is None:
+            return
+        with _events_stores_lock:
+            store.users -= 1
+            if store.users == 0:
+                del _events_stores[store.path]
+                with store.lock:
+                    store.conn.close()
+    
+    def __enter__(self) -> 'AgenticLearningSystem':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _open_events_db(self, path: str) -> sqlite3.Connection:
+        """Open the append-only learning events store, importing the legacy JSON file if it is empty"""
+        conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL: appends don't block readers (e.g. the verification script)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS events (
+                timestamp TEXT NOT NULL,
+                event_type TEXT,
+                brand_name TEXT,
+                domain TEXT,
+                confidence_predicted REAL,
+                user_action TEXT,
+                manual INTEGER NOT NULL DEFAULT 0, -- features.manual_training
+                source TEXT, -- metadata.user_source
+                features TEXT, -- JSON object
+                metadata TEXT -- JSON object
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_manual_brand ON events(manual, brand_name);
+        ''')
+        
+        if os.path.exists(self.events_file) and not conn.execute('SELECT 1 FROM events LIMIT 1').fetchone():
+            try:
+                with open(self.events_file, 'r') as f:
+                    events = [LearningEvent(**event) for event in json.load(f)]
+                with conn:
+                    conn.executemany(_INSERT_EVENT_SQL, [self._event_row(event) for event in events])
+                logger.info(f"📦 Imported {len(events)} learning events from {self.events_file}")
+            except Exception as e:
+                logger.error(f"Error importing legacy learning events: {e}")
+        return conn
+    
+    @staticmethod
+    def _event_row(event: LearningEvent) -> Tuple:
+        """Flatten a learning event into an events table row"""
+        features = event.features or {}
+        metadata = event.metadata or {}
+        return (
+            event.timestamp, event.event_type, event.brand_name, event.domain,
+            event.confidence_predicted, event.user_action,
+            1 if features.get('manual_training') else 0,
+            metadata.get('user_source', 'unknown'),
+            json.dumps(event.features), json.dumps(event.metadata)
+        )
+    
     def _load_learning_events(self) -> List[LearningEvent]:
-        """Load learning events from file"""
+        """Load learning events from the events database"""
         try:
-            with open(self.events_file, 'r') as f:
-                data = json.load(f)
-                return [LearningEvent(**event) for event in data]
-        except FileNotFoundError:
-            return []
+            store = self._events_store()
+            with store.lock:
+                rows = store.conn.execute(
+                    'SELECT rowid, timestamp, event_type, brand_name, domain, confidence_predicted, '
+                    'user_action, features, metadata FROM events ORDER BY rowid'
+                ).fetchall()
+            return [
+                LearningEvent(timestamp, event_type, brand_name, domain, confidence, action,
+                              json.loads(features), json.loads(metadata), rowid)
+                for rowid, timestamp, event_type, brand_name, domain, confidence, action, features, metadata in rows
+            ]
         except Exception as e:
             logger.error(f"Error loading learning events: {e}")
             return []
     
     def _save_learning_events(self):
-        """Save learning events to file"""
+        """Append events that have no events table row yet (no full rewrite)"""
+        new_events = [event for event in self.learning_events if event.rowid is None]
+        if not new_events:
+            return
         try:
-            with open(self.events_file, 'w') as f:
-                json.dump([asdict(event) for event in self.learning_events], f, indent=2)
+            store = self._events_store()
+            with store.lock, store.conn:
+                rowids = [store.conn.execute(_INSERT_EVENT_SQL, self._event_row(event)).lastrowid
+                          for event in new_events]
+            # Only mark events saved once the transaction has committed
+            for event, rowid in zip(new_events, rowids):
+                event.rowid = rowid
         except Exception as e:
             logger.error(f"Error saving learning events: {e}")
     
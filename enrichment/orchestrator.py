@@ -9,6 +9,7 @@ import json
 import re
 import time
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from .safe_search import SafeSearchSystem
@@ -20,6 +21,40 @@ import requests
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Domain words typical of spirits/wine/beer producers
+_SPIRIT_DOMAIN_KEYWORDS = ('spirits', 'distillery', 'whiskey', 'vodka', 'gin', 'rum', 'bourbon', 'wine', 'brewery')
+
+# Domain parts that suggest a blog/shop rather than the official site
+_NON_OFFICIAL_DOMAIN_PARTS = ('blog', 'shop', 'store', 'news')
+
+@lru_cache(maxsize=1024)
+def _legacy_website_confidence(brand_name: str, domain: str) -> float:
+    """Domain-only website confidence; pure in (brand, domain) so results are memoized"""
+    confidence = 0.0
+    brand_lower = brand_name.lower().replace(' ', '')
+    domain_lower = domain.lower()
+    
+    # Exact brand name in domain (highest confidence)
+    if brand_lower in domain_lower or any(word in domain_lower for word in brand_lower.split()):
+        confidence += 0.4
+    
+    # Common patterns for spirits brands
+    if any(keyword in domain_lower for keyword in _SPIRIT_DOMAIN_KEYWORDS):
+        confidence += 0.2
+    
+    # Brand name appears in multiple parts of domain
+    brand_words = brand_name.lower().split()
+    if len(brand_words) > 1:
+        word_matches = sum(1 for word in brand_words if word in domain_lower)
+        confidence += (word_matches / len(brand_words)) * 0.3
+    
+    # Domain structure suggests official site
+    if domain_lower.count('.') == 1 and not any(sub in domain_lower for sub in _NON_OFFICIAL_DOMAIN_PARTS):
+        confidence += 0.1
+    
+    return min(1.0, confidence)
+
+
 class IntegratedEnrichmentSystem:
     """
     Complete enrichment pipeline: Safe Search → Founder Discovery → Apollo.io
@@ -406,7 +441,7 @@ class IntegratedEnrichmentSystem:
         # Use enhanced URL scorer to re-rank results based on snippet analysis
         if unique_results:
             logger.info(f"🔍 Applying enhanced URL scoring to {len(unique_results)} results")
-            unique_results = self.url_scorer.rank_urls(unique_results, brand_name, brand_context)
+            unique_results = self.url_scorer.rank_urls(unique_results, brand_name, brand_context, top_n=5)
             
             # Log top results with enhanced scores
             for i, result in enumerate(unique_results[:3]):
@@ -1583,30 +1618,7 @@ class IntegratedEnrichmentSystem:
     
     def _calculate_website_confidence_legacy(self, brand_name: str, website_url: str, domain: str) -> float:
         """Legacy website confidence calculation for backward compatibility"""
-        confidence = 0.0
-        brand_lower = brand_name.lower().replace(' ', '')
-        domain_lower = domain.lower()
-        
-        # Exact brand name in domain (highest confidence)
-        if brand_lower in domain_lower or any(word in domain_lower for word in brand_lower.split()):
-            confidence += 0.4
-        
-        # Common patterns for spirits brands
-        spirit_keywords = ['spirits', 'distillery', 'whiskey', 'vodka', 'gin', 'rum', 'bourbon', 'wine', 'brewery']
-        if any(keyword in domain_lower for keyword in spirit_keywords):
-            confidence += 0.2
-        
-        # Brand name appears in multiple parts of domain
-        brand_words = brand_name.lower().split()
-        if len(brand_words) > 1:
-            word_matches = sum(1 for word in brand_words if word in domain_lower)
-            confidence += (word_matches / len(brand_words)) * 0.3
-        
-        # Domain structure suggests official site
-        if domain_lower.count('.') == 1 and not any(sub in domain_lower for sub in ['blog', 'shop', 'store', 'news']):
-            confidence += 0.1
-        
-        return min(1.0, confidence)
+        return _legacy_website_confidence(brand_name, domain)
     
     def record_website_feedback(self, brand_name: str, website_data: Dict, user_action: str, notes: str = ""):
         """Record user feedback for learning"""
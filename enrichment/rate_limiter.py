@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Adaptive Per-Host Rate Limiting
+Per-host rates that back off on 429/Retry-After and recover on success,
+plus a scheduler that spaces requests evenly at those rates
+"""
+
+import asyncio
+import random
+import time
+import logging
+from typing import Dict, Optional, Any
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+# Response statuses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+
+class HostRateLimiter:
+    """
+    Adaptive request rate keyed by host
+
+    - Runs at the baseline rate while the host is happy
+    - Halves the host's rate on every 429/503 and honours Retry-After
+    - Steps back toward the baseline rate after a run of 2xx responses
+    """
+
+    def __init__(self, rps: float = 0.5, min_rps: float = 0.02, recovery_successes: int = 10):
+        self.rps = rps
+        self.min_rps = min_rps
+        self.recovery_successes = recovery_successes
+        self.hosts: Dict[str, Dict[str, float]] = {}
+
+    def _bucket(self, host: str) -> Dict[str, float]:
+        """Get (or create) the bucket state for a host"""
+        bucket = self.hosts.get(host)
+        if bucket is None:
+            bucket = {
+                'rps': self.rps,
+                'blocked_until': 0.0,
+                'success_streak': 0,
+            }
+            self.hosts[host] = bucket
+        return bucket
+
+    def current_rate(self, host: str) -> float:
+        """Current allowed requests per second for a host"""
+        bucket = self.hosts.get(host)
+        return bucket['rps'] if bucket else self.rps
+
+    def blocked_until(self, host: str) -> float:
+        """Monotonic time before which a host asked us not to send requests (Retry-After)"""
+        bucket = self.hosts.get(host)
+        return bucket['blocked_until'] if bucket else 0.0
+
+    def record_response(self, host: str, status: int, retry_after: Optional[str] = None,
+                        is_document: bool = True):
+        """Adjust a host's rate from an observed response"""
+        bucket = self._bucket(host)
+
+        if status in THROTTLE_STATUSES:
+            bucket['rps'] = max(self.min_rps, bucket['rps'] * 0.5)
+            bucket['success_streak'] = 0
+
+            wait = self._parse_retry_after(retry_after)
+            if wait:
+                bucket['blocked_until'] = max(bucket['blocked_until'], time.monotonic() + wait)
+
+            logger.warning(f"⏳ Throttled by {host} ({status}), rate now {bucket['rps']:.3f} req/s"
+                           + (f", retry after {wait:.0f}s" if wait else ""))
+
+        elif 200 <= status < 300 and is_document:
+            bucket['success_streak'] += 1
+            if bucket['success_streak'] >= self.recovery_successes and bucket['rps'] < self.rps:
+                bucket['rps'] = min(self.rps, bucket['rps'] * 2)
+                bucket['success_streak'] = 0
+                logger.info(f"Rate for {host} recovered to {bucket['rps']:.3f} req/s")
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> float:
+        """Parse a Retry-After header (delta-seconds or HTTP-date)"""
+        if not value:
+            return 0.0
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current per-host rates for monitoring"""
+        return {
+            host: {'rps': round(bucket['rps'], 3), 'success_streak': bucket['success_streak']}
+            for host, bucket in self.hosts.items()
+        }
+
+
+class HostScheduler:
+    """
+    Hands out monotonically increasing per-host request slots
+
+    Each caller reserves the next slot and then sleeps until exactly that
+    time, so requests stay evenly spaced (plus a little jitter) instead of
+    bursting when many independent sleeps expire together. Reserving has no
+    await in it, so it needs no lock and nothing is bound to one event loop.
+    Spacing follows the limiter's current rate and any Retry-After block.
+    """
+
+    def __init__(self, limiter: Optional[HostRateLimiter] = None, min_interval: float = 0.0,
+                 jitter: float = 0.1):
+        self.limiter = limiter
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.next_slot: Dict[str, float] = {}
+        self._rng = random.Random()
+
+    async def wait(self, host: str):
+        """Wait for this caller's reserved slot on host"""
+        now = time.monotonic()
+        slot = max(now, self.next_slot.get(host, 0.0))
+        interval = self.min_interval
+
+        if self.limiter is not None:
+            slot = max(slot, self.limiter.blocked_until(host))
+            interval = max(interval, 1.0 / self.limiter.current_rate(host))
+
+        self.next_slot[host] = slot + interval + self._rng.random() * self.jitter
+        delay = slot - now
+
+        if delay > 0:
+            logger.debug(f"Scheduler: {host} slot in {delay:.2f}s")
+            await asyncio.sleep(delay)
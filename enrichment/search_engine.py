@@ -10,18 +10,119 @@ import random
 import logging
 import json
 import hashlib
-from typing import Dict, List, Optional, Any
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 from datetime import datetime, timedelta
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlsplit
 
 from .stealth_system import EnhancedStealthSystem
 from .proxy_manager import ProxyManager
 from .captcha_handler import CaptchaHandler
 from .human_behavior import HumanBehaviorSimulator
+from .rate_limiter import HostRateLimiter, HostScheduler, THROTTLE_STATUSES
+
+# Optional faster libuv-based event loop, installed only via install_fast_event_loop()
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Optional HTTP fast path (plain GET before falling back to a browser)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Optional persistent SQLite-backed result cache
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+try:
+    from lxml import etree, html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# C-backed result parsing (selectolax preferred, lxml as fallback)
+PARSER_AVAILABLE = SELECTOLAX_AVAILABLE or LXML_AVAILABLE
+
+# Bing result selectors, compiled once (XPath compilation is expensive)
+RESULT_CSS = 'li.b_algo'
+if LXML_AVAILABLE:
+    RESULT_XPATH = etree.XPath('//li[contains(concat(" ", normalize-space(@class), " "), " b_algo ")]')
+    TITLE_XPATH = etree.XPath('string(.//h2)')
+    LINK_XPATH = etree.XPath('(.//h2//a/@href | .//a/@href)[1]')
+    SNIPPET_XPATH = etree.XPath(
+        'string((.//*[contains(concat(" ", normalize-space(@class), " "), " b_caption ")]//p'
+        ' | .//*[contains(concat(" ", normalize-space(@class), " "), " b_caption ")])[1])'
+    )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Search engine entry point (used for per-host concurrency accounting)
+SEARCH_URL = 'https://www.bing.com/'
+SEARCH_RESULTS_URL = 'https://www.bing.com/search?q='
+SEARCH_HOST = urlsplit(SEARCH_URL).netloc
+
+# HTTP fast path must return at least this many results to skip the browser
+MIN_HTTP_RESULTS = 3
+
+# Keyed BLAKE2b namespaces cache keys without building a prefixed string
+CACHE_KEY_SALT = b'production'
+CACHE_TTL = timedelta(days=14)  # Extended cache
+CACHE_SIZE_LIMIT = 2 << 30  # 2 GiB on disk
+
+
+def cache_digest(query: str) -> bytes:
+    """Non-cryptographic 16-byte cache key for a search query"""
+    return hashlib.blake2b(query.encode('utf-8', 'ignore'), digest_size=16, key=CACHE_KEY_SALT).digest()
+
+
+def cache_key(query: str) -> str:
+    """Hex form of cache_digest() for the JSON cache file"""
+    return cache_digest(query).hex()
+
+
+def dedupe_results(results: List[Dict]) -> List[Dict]:
+    """Drop repeated results in one pass, keyed on (host, normalized title prefix)"""
+    seen = set()
+    unique = []
+    for result in results:
+        key = (urlsplit(result.get('url', '')).netloc, result.get('title', '')[:40].lower().strip())
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(result)
+    return unique
+
+
+def _warn_not_closed(session_id: str):
+    """Finalizer: the owner dropped a search system with a live browser"""
+    logger.warning(f"Search session {session_id} was not shut down - browser resources leaked. "
+                   f"Use 'async with ProductionSearchSystem()' or await shutdown().")
+
+
+def install_fast_event_loop() -> bool:
+    """Opt in to uvloop as the process-wide event loop policy; call once from an entry point"""
+    if not UVLOOP_AVAILABLE:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 class ProductionSearchSystem:
     """
     Enterprise-grade search system with comprehensive anti-detection measures
@@ -39,13 +140,14 @@ class ProductionSearchSystem:
     def __init__(self, 
                  headless: bool = True, 
                  use_proxies: bool = False, 
-                 paid_proxies: bool = False):
+                 paid_proxies: bool = False,
+                 low_mem: bool = False):
         
         self.headless = headless
         self.use_proxies = use_proxies
         
         # Initialize subsystems
-        self.stealth_system = EnhancedStealthSystem()
+        self.stealth_system = EnhancedStealthSystem(low_mem=low_mem)
         self.proxy_manager = ProxyManager(use_paid_proxies=paid_proxies) if use_proxies else None
         self.captcha_handler = CaptchaHandler()
         self.human_behavior = HumanBehaviorSimulator()
@@ -56,7 +158,12 @@ class ProductionSearchSystem:
             'min_delay': 0.5,  # Ultra-aggressive: minimal delay               # Minimum 5 seconds for user testing
             'max_delay': 3,  # Ultra-aggressive: very fast              # Maximum 15 seconds for user testing
             'burst_protection': True,     # Prevent burst requests
+            'max_concurrent': 16,         # Total concurrent searches in search_many
+            'max_concurrent_per_host': 4, # Concurrent searches against one engine host
+            'requests_per_second_per_host': 0.5,  # Scheduler baseline, adapts on 429
         }
+        self.rate_limiter = HostRateLimiter(rps=self.rate_limits['requests_per_second_per_host'])
+        self.scheduler = HostScheduler(self.rate_limiter)
         
         # Request tracking and analytics
         self.request_history = []
@@ -64,8 +171,9 @@ class ProductionSearchSystem:
         self.total_requests = 0
         self.successful_requests = 0
         
-        # Cache system
+        # Cache system (diskcache when installed, JSON file otherwise)
         self.cache_file = 'data/production_search_cache.json'
+        self.cache_dir = 'data/cache/production_search'
         self.load_cache()
         
         # Session management
@@ -73,11 +181,21 @@ class ProductionSearchSystem:
         self.session_start_time = datetime.now()
         self.browser = None
         self.context = None
+        # asyncio Locks/Semaphores bind to the loop that first uses them, so they are
+        # created per running loop by _bind_loop() instead of here
+        self._primitives_loop = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._query_locks = weakref.WeakValueDictionary()
+        self._sync_loop = None  # Owned loop for the synchronous wrappers (see run_sync)
+        self._http = None
+        self._finalizer = None
         
         # Adaptive behavior
         self.failure_streak = 0
         self.max_failure_streak = 3
         self.last_proxy_rotation = datetime.now()
+        self._rng = random.Random()  # Private RNG, independent of the global random state
         
         # Performance monitoring
         self.performance_stats = {
@@ -86,16 +204,55 @@ class ProductionSearchSystem:
             'requests_count': 0,
         }
     
+    async def __aenter__(self) -> 'ProductionSearchSystem':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.shutdown()
+    
+    def _track_browser_open(self):
+        """Warn at collection/interpreter exit if the browser is never closed"""
+        if self._finalizer is None or not self._finalizer.alive:
+            self._finalizer = weakref.finalize(self, _warn_not_closed, self.session_id)
+    
     def load_cache(self):
         """Load search cache with extended retention"""
         try:
             with open(self.cache_file, 'r') as f:
-                self.cache = json.load(f)
+                cache = json.load(f)
         except:
-            self.cache = {}
+            cache = {}
+        
+        if DISKCACHE_AVAILABLE:
+            self.cache = diskcache.Cache(self.cache_dir, size_limit=CACHE_SIZE_LIMIT)
+            if len(self.cache) == 0 and cache:
+                self._import_json_cache(cache)
+            return
+        
+        # Re-key entries written under older key schemes (every entry stores its query)
+        self.cache = {
+            (cache_key(entry['query']) if isinstance(entry, dict) and 'query' in entry else key): entry
+            for key, entry in cache.items()
+        }
+    
+    def _import_json_cache(self, cache: Dict[str, Dict]):
+        """One-time migration of unexpired JSON cache entries into diskcache"""
+        imported = 0
+        for entry in cache.values():
+            try:
+                age = datetime.now() - datetime.fromisoformat(entry['timestamp'])
+                remaining = (CACHE_TTL - age).total_seconds()
+                if remaining > 0:
+                    self.cache.set(cache_digest(entry['query']), entry, expire=remaining)
+                    imported += 1
+            except (KeyError, TypeError, ValueError):
+                continue
+        logger.info(f"Imported {imported} cached searches into {self.cache_dir}")
     
     def save_cache(self):
         """Save search cache"""
+        if DISKCACHE_AVAILABLE:
+            return  # diskcache writes are already durable
         try:
             import os
             os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
@@ -135,7 +292,7 @@ class ProductionSearchSystem:
             return True
         
         # Rotate randomly (5% chance)
-        if random.random() < 0.05:
+        if self._rng.random() < 0.05:
             return True
         
         return False
@@ -217,6 +374,7 @@ class ProductionSearchSystem:
                     if self.proxy_manager:
                         self.proxy_manager.mark_proxy_failed({'http': proxy_config['server']})
             
+            self._track_browser_open()
             self.stealth_system.track_session(self.session_id, 'browser_setup_with_proxy')
             logger.info(f"Production browser setup completed (session: {self.session_id})")
             return True
@@ -237,32 +395,119 @@ class ProductionSearchSystem:
                 self.browser = None
         except Exception as e:
             logger.error(f"Browser cleanup error: {e}")
+        finally:
+            if self._finalizer is not None:
+                self._finalizer.detach()
     
-    async def intelligent_delay(self):
-        """Ultra-intelligent delay system for production"""
-        # Base delay from stealth system
-        base_delay = self.stealth_system.calculate_smart_delay()
-        
-        # Adjust based on success rate
-        success_rate = self.calculate_success_rate()
-        if success_rate < 50:  # Optimized: stricter threshold  # If success rate is low, slow down
-            base_delay *= random.uniform(1.2, 1.8)  # Optimized: reduced penalty
-            logger.info(f"Low success rate ({success_rate:.1f}%), increasing delay")
-        
-        # Adjust based on failure streak
-        if self.failure_streak > 0:
-            base_delay *= (1 + self.failure_streak * 0.3)  # Optimized: reduced penalty
-            logger.info(f"Failure streak detected, increasing delay by {self.failure_streak * 50}%")
+    def _on_response(self, response):
+        """Feed page responses into the per-host rate limiter"""
+        try:
+            self.rate_limiter.record_response(
+                urlsplit(response.url).netloc,
+                response.status,
+                response.headers.get('retry-after'),
+                is_document=response.request.resource_type == 'document'
+            )
+        except Exception as e:
+            logger.debug(f"Rate limiter response hook error: {e}")
+    
+    def _get_http_client(self):
+        """Lazily create the pooled HTTP/2 client used by the fast path"""
+        if self._http is None:
+            fingerprint = self.stealth_system.get_random_fingerprint()
+            self._http = httpx.AsyncClient(
+                http2=True,
+                headers=self.stealth_system.get_realistic_headers(
+                    fingerprint['user_agent'],
+                    fingerprint['browser_type']
+                ),
+                timeout=10,
+                follow_redirects=True,
+            )
+        return self._http
+    
+    def _iter_result_fields(self, html: str, max_results: int):
+        """Yield (title, snippet, href) for each Bing result in the markup"""
+        if SELECTOLAX_AVAILABLE:
+            for node in HTMLParser(html).css(RESULT_CSS)[:max_results]:
+                title_node = node.css_first('h2')
+                link_node = node.css_first('h2 a') or node.css_first('a')
+                snippet_node = node.css_first('.b_caption p') or node.css_first('.b_caption')
+                yield (
+                    title_node.text(strip=True) if title_node else "",
+                    snippet_node.text(strip=True) if snippet_node else "",
+                    (link_node.attributes.get('href') or "") if link_node else "",
+                )
+        else:
+            for node in RESULT_XPATH(lxml_html.fromstring(html))[:max_results]:
+                links = LINK_XPATH(node)
+                yield (
+                    TITLE_XPATH(node).strip(),
+                    SNIPPET_XPATH(node).strip(),
+                    str(links[0]) if links else "",
+                )
+    
+    def _parse_results(self, html: str, max_results: int = 12) -> List[Dict]:
+        """Parse Bing result markup into result dicts"""
+        results = []
+        for title, snippet, href in self._iter_result_fields(html, max_results):
+            url = href if href.startswith('http') else ""
+            
+            if (title or snippet) and len(title + snippet) > 10:
+                results.append({
+                    'title': title,
+                    'snippet': snippet[:300],  # Limit snippet length
+                    'url': url,
+                    'source': 'production_bing',
+                    'timestamp': datetime.now().isoformat(),
+                    'session_id': self.session_id
+                })
+        return dedupe_results(results)
+    
+    async def _try_http(self, query: str) -> Tuple[Optional[List[Dict]], bool]:
+        """
+        Fast path: fetch Bing results with a plain HTTP GET
         
-        # Add randomization to avoid patterns
-        final_delay = base_delay * random.uniform(0.8, 1.4)
+        Returns (results, slot_reserved). results is None when the browser is
+        needed (library missing, request failed, bot challenge, or too few
+        parseable results); slot_reserved says this attempt already took a
+        scheduler slot that the browser escalation may reuse (not throttled).
+        """
+        if not (HTTPX_AVAILABLE and PARSER_AVAILABLE):
+            return None, False
         
-        # Ensure within bounds
-        final_delay = max(self.rate_limits['min_delay'], 
-                         min(self.rate_limits['max_delay'], final_delay))
+        start_time = time.time()
+        slot_reserved = False
+        try:
+            await self.scheduler.wait(SEARCH_HOST)
+            slot_reserved = True
+            response = await self._get_http_client().get(SEARCH_RESULTS_URL + quote_plus(query))
+            self.rate_limiter.record_response(
+                SEARCH_HOST, response.status_code, response.headers.get('retry-after')
+            )
+            if response.status_code != 200:
+                logger.info(f"HTTP fast path got {response.status_code}, escalating to browser")
+                return None, response.status_code not in THROTTLE_STATUSES
+            
+            html = response.text
+            if 'captcha' in html.lower():
+                logger.info("HTTP fast path hit a challenge page, escalating to browser")
+                return None, True
+            
+            results = self._parse_results(html)
+            if len(results) < MIN_HTTP_RESULTS:
+                logger.info(f"HTTP fast path found only {len(results)} results, escalating to browser")
+                return None, True
+        except Exception as e:
+            logger.debug(f"HTTP fast path error: {e}")
+            return None, slot_reserved
         
-        logger.info(f"Intelligent delay: {final_delay:.1f}s (base: {base_delay:.1f}s)")
-        await asyncio.sleep(final_delay)
+        self.successful_requests += 1
+        self.failure_streak = 0
+        response_time = time.time() - start_time
+        self.update_performance_stats(response_time)
+        logger.info(f"HTTP fast path found {len(results)} results for: {query} (took {response_time:.2f}s)")
+        return results, True
     
     async def search_bing_with_anti_detection(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
@@ -384,29 +629,8 @@ class ProductionSearchSystem:
         try:
             playwright = await self.stealth_system.get_playwright_instance()
             
-            # Enhanced browser launch arguments
-            browser_args = [
-                '--disable-blink-features=AutomationControlled',
-                '--disable-features=VizDisplayCompositor',
-                '--disable-automation',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=TranslateUI',
-                '--disable-extensions',
-                '--disable-plugins',
-                '--disable-images',  # Faster loading
-                '--disable-javascript-harmony-shipping',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-                '--disable-field-trial-config',
-                '--disable-back-forward-cache',
-                '--enable-automation=false',
-                '--window-size=1366,768',  # Common resolution
-                '--start-maximized'
-            ]
+            # Shared vetted launch arguments
+            browser_args = self.stealth_system.get_browser_args(self.headless)
             
             fingerprint = self.stealth_system.generate_fingerprint()
             
@@ -457,6 +681,10 @@ class ProductionSearchSystem:
                 });
             """)
             
+            # Skip images, fonts, media and trackers (CAPTCHA assets are exempt)
+            await self.stealth_system.apply_resource_blocking(self.context)
+            
+            self._track_browser_open()
             logger.info(f"🛡️ Enhanced stealth browser setup completed (session: {self.session_id})")
             
         except Exception as e:
@@ -500,38 +728,151 @@ class ProductionSearchSystem:
         if self.success_rate < 30 and self.total_requests >= 10:
             logger.error(f"🚨 Critical failure rate: {self.success_rate:.1f}% - immediate fallback recommended")
 
-    async def search_with_full_protection(self, query: str) -> List[Dict]:
-        """
-        Main search method with full protection suite
+    def _bind_loop(self):
+        """(Re)create the asyncio primitives when called from a different event loop than before"""
+        loop = asyncio.get_running_loop()
+        if self._primitives_loop is not loop:
+            self._primitives_loop = loop
+            self._browser_lock = asyncio.Lock()
+            self._host_semaphores = {}
+            self._query_locks = weakref.WeakValueDictionary()
+    
+    @asynccontextmanager
+    async def acquire_context(self) -> AsyncIterator[Any]:
         """
-        start_time = time.time()
+        Borrow an isolated browser context from the shared browser
         
-        try:
-            # Setup browser if needed
+        All contexts share one Chromium process; each gets its own
+        fingerprint, cookies and storage and is closed on release.
+        """
+        self._bind_loop()
+        async with self._browser_lock:
             if not self.browser:
                 if not await self.setup_browser_with_proxy():
-                    return []
-            
-            # Create new page
-            page = await self.context.new_page()
-            
+                    raise Exception("Browser setup failed")
+            browser = self.browser
+        
+        context = await self.stealth_system.new_stealth_context(browser)
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Context close error: {e}")
+    
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Get the concurrency limiter for a single search host"""
+        self._bind_loop()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.rate_limits['max_concurrent_per_host'])
+            self._host_semaphores[host] = semaphore
+        return semaphore
+    
+    async def _extract_results_from_dom(self, page) -> List[Dict]:
+        """Fallback extraction via Playwright locators (no HTML parser installed)"""
+        results = []
+        result_elements = await page.locator('.b_algo').all()
+        
+        for element in result_elements[:12]:  # Get more results
+            try:
+                title = ""
+                snippet = ""
+                url = ""
+                
+                # Extract with multiple fallbacks
+                try:
+                    title_elem = element.locator('h2')
+                    if await title_elem.is_visible():
+                        title = await title_elem.inner_text()
+                except:
+                    pass
+                
+                try:
+                    snippet_elem = element.locator('.b_caption')
+                    if await snippet_elem.is_visible():
+                        snippet = await snippet_elem.inner_text()
+                except:
+                    pass
+                
+                try:
+                    link_elem = element.locator('a').first
+                    if await link_elem.is_visible():
+                        href = await link_elem.get_attribute('href')
+                        if href and href.startswith('http'):
+                            url = href
+                except:
+                    pass
+                
+                if (title.strip() or snippet.strip()) and len(title + snippet) > 10:
+                    results.append({
+                        'title': title.strip(),
+                        'snippet': snippet.strip()[:300],  # Limit snippet length
+                        'url': url.strip(),
+                        'source': 'production_bing',
+                        'timestamp': datetime.now().isoformat(),
+                        'session_id': self.session_id
+                    })
+                    
+            except Exception as e:
+                logger.debug(f"Error extracting result: {e}")
+                continue
+        
+        return dedupe_results(results)
+    
+    async def _results_document_html(self, responses: List[Any]) -> str:
+        """Body of the last captured results document, or '' if unavailable"""
+        if not responses:
+            return ''
+        try:
+            return await responses[-1].text()
+        except Exception as e:
+            # Body can be evicted once the page navigates on
+            logger.debug(f"Results document body unavailable: {e}")
+            return ''
+    
+    async def _search_in_ctx(self, context, query: str, slot_reserved: bool = False) -> List[Dict]:
+        """
+        Run one protected Bing search inside the given browser context
+        
+        slot_reserved: the HTTP fast path already waited for this query's slot
+        """
+        # Create new page
+        page = await context.new_page()
+        
+        try:
             # Track search
             self.stealth_system.track_session(self.session_id, f'search:{query}')
             
+            # Adaptive pacing: watch for 429/Retry-After on every response
+            page.on("response", self._on_response)
+            if not slot_reserved:
+                await self.scheduler.wait(SEARCH_HOST)
+            
+            # Keep the results document response (local to this page, safe under fan-out)
+            results_documents = []
+            
+            def _capture_results_document(response):
+                if response.url.startswith(SEARCH_RESULTS_URL) and response.request.resource_type == 'document':
+                    results_documents.append(response)
+            
+            page.on("response", _capture_results_document)
+            
             # Navigate with protection
-            await page.goto('https://www.bing.com/', wait_until='networkidle')
+            await page.goto(SEARCH_URL, wait_until='networkidle')
             
             # Extended human behavior simulation
             await self.stealth_system.simulate_human_behavior(page)
             
             # Handle any popups or consent forms
             try:
-                await asyncio.sleep(random.uniform(1, 3))
+                await asyncio.sleep(self._rng.uniform(1, 3))
                 consent_buttons = await page.locator('button:has-text("Accept"), button:has-text("Allow"), #bnp_btn_accept').all()
                 for button in consent_buttons:
                     if await button.is_visible():
                         await button.click()
-                        await asyncio.sleep(random.uniform(1, 2))
+                        await asyncio.sleep(self._rng.uniform(1, 2))
                         break
             except:
                 pass
@@ -539,89 +880,70 @@ class ProductionSearchSystem:
             # Perform search with natural typing
             search_input = page.locator('input[name="q"], #sb_form_q')
             await search_input.click()
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            await asyncio.sleep(self._rng.uniform(0.5, 1.5))
             
             # Type naturally
             for char in query:
                 await search_input.type(char)
-                await asyncio.sleep(random.uniform(0.05, 0.2))
+                await asyncio.sleep(self._rng.uniform(0.05, 0.2))
             
-            await asyncio.sleep(random.uniform(0.5, 2.0))
+            await asyncio.sleep(self._rng.uniform(0.5, 2.0))
             await search_input.press('Enter')
             
             # Wait for results with extended timeout
             await page.wait_for_selector('.b_algo', timeout=25000)
             
             # Simulate reading time
-            await asyncio.sleep(random.uniform(3, 8))
-            
-            # Extract results
-            results = []
-            result_elements = await page.locator('.b_algo').all()
+            await asyncio.sleep(self._rng.uniform(3, 8))
             
-            for element in result_elements[:12]:  # Get more results
-                try:
-                    title = ""
-                    snippet = ""
-                    url = ""
-                    
-                    # Extract with multiple fallbacks
-                    try:
-                        title_elem = element.locator('h2')
-                        if await title_elem.is_visible():
-                            title = await title_elem.inner_text()
-                    except:
-                        pass
-                    
-                    try:
-                        snippet_elem = element.locator('.b_caption')
-                        if await snippet_elem.is_visible():
-                            snippet = await snippet_elem.inner_text()
-                    except:
-                        pass
-                    
-                    try:
-                        link_elem = element.locator('a').first
-                        if await link_elem.is_visible():
-                            href = await link_elem.get_attribute('href')
-                            if href and href.startswith('http'):
-                                url = href
-                    except:
-                        pass
-                    
-                    if (title.strip() or snippet.strip()) and len(title + snippet) > 10:
-                        results.append({
-                            'title': title.strip(),
-                            'snippet': snippet.strip()[:300],  # Limit snippet length
-                            'url': url.strip(),
-                            'source': 'production_bing',
-                            'timestamp': datetime.now().isoformat(),
-                            'session_id': self.session_id
-                        })
-                        
-                except Exception as e:
-                    logger.debug(f"Error extracting result: {e}")
-                    continue
+            # Extract results from one HTML snapshot instead of per-element IPC calls,
+            # preferring the raw network body over re-serialising the rendered DOM
+            if PARSER_AVAILABLE:
+                document_html = await self._results_document_html(results_documents)
+                results = self._parse_results(document_html) if document_html else []
+                if not results:
+                    results = self._parse_results(await page.content())
+            else:
+                results = await self._extract_results_from_dom(page)
             
             # Additional human behavior
             if results:
                 # Sometimes scroll to see more results
-                if random.random() < 0.4:
-                    scroll_amount = random.randint(300, 800)
+                if self._rng.random() < 0.4:
+                    scroll_amount = self._rng.randint(300, 800)
                     await page.evaluate(f"window.scrollBy(0, {scroll_amount})")
-                    await asyncio.sleep(random.uniform(2, 5))
+                    await asyncio.sleep(self._rng.uniform(2, 5))
                 
                 # Sometimes click on a result (but immediately go back)
-                if random.random() < 0.2 and len(results) > 1:
+                if self._rng.random() < 0.2 and len(results) > 1:
                     try:
                         result_link = page.locator('.b_algo a').first
                         await result_link.click()
-                        await asyncio.sleep(random.uniform(1, 3))
+                        await asyncio.sleep(self._rng.uniform(1, 3))
                         await page.go_back()
-                        await asyncio.sleep(random.uniform(1, 2))
+                        await asyncio.sleep(self._rng.uniform(1, 2))
                     except:
                         pass
             
+            return results
+        
+        finally:
+            await page.close()
+    
+    async def search_with_full_protection(self, query: str, slot_reserved: bool = False) -> List[Dict]:
+        """
+        Main search method with full protection suite
+        """
+        start_time = time.time()
+        
+        try:
+            # Setup browser if needed
+            if not self.browser:
+                if not await self.setup_browser_with_proxy():
+                    return []
+            
+            results = await self._search_in_ctx(self.context, query, slot_reserved)
+            
             # Success tracking
             self.successful_requests += 1
             self.failure_streak = 0
@@ -632,79 +954,188 @@ class ProductionSearchSystem:
             
             logger.info(f"Production search found {len(results)} results for: {query} (took {response_time:.2f}s)")
             
-            await page.close()
             return results
             
         except Exception as e:
-            self.failure_streak += 1
-            logger.error(f"Production search error: {e}")
-            
-            # Adaptive failure handling
-            if self.failure_streak >= self.max_failure_streak:
-                logger.warning("Max failure streak reached, recreating browser...")
-                await self.cleanup_browser()
-                self.failure_streak = 0
-            
+            await self._record_search_failure(query, e)
             return []
     
+    async def _record_search_failure(self, query: str, error: Exception):
+        """Count a failed browser search and recycle the browser after too many in a row"""
+        self.failure_streak += 1
+        logger.error(f"Production search error for '{query}': {error}")
+        
+        # Adaptive failure handling
+        if self.failure_streak >= self.max_failure_streak:
+            logger.warning("Max failure streak reached, recreating browser...")
+            await self.cleanup_browser()
+            self.failure_streak = 0
+    
+    def get_cached_results(self, query: str) -> Optional[List[Dict]]:
+        """Return unexpired cached results for a query, or None"""
+        if DISKCACHE_AVAILABLE:
+            # Expiry is enforced by diskcache itself
+            cached_data = self.cache.get(cache_digest(query))
+            return cached_data.get('results', []) if cached_data else None
+        
+        cached_data = self.cache.get(cache_key(query))
+        if cached_data and 'timestamp' in cached_data:
+            cache_time = datetime.fromisoformat(cached_data['timestamp'])
+            if (datetime.now() - cache_time) < CACHE_TTL:
+                return cached_data.get('results', [])
+        return None
+    
+    def _store_cache(self, query: str, results: List[Dict]):
+        """Cache successful results for a query"""
+        entry = {
+            'results': results,
+            'timestamp': datetime.now().isoformat(),
+            'query': query,
+            'session_id': self.session_id
+        }
+        if DISKCACHE_AVAILABLE:
+            self.cache.set(cache_digest(query), entry, expire=CACHE_TTL.total_seconds())
+        else:
+            self.cache[cache_key(query)] = entry
+            self.save_cache()
+    
+    def _query_lock(self, query: str) -> asyncio.Lock:
+        """Per-query lock so concurrent cache misses trigger only one search"""
+        self._bind_loop()
+        key = cache_digest(query)
+        lock = self._query_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._query_locks[key] = lock
+        return lock
+    
     async def search(self, query: str) -> List[Dict]:
         """
         Main search interface with full protection
         """
         self.total_requests += 1
         
-        # Check cache first
-        cache_key = hashlib.md5(f"production_{query}".encode()).hexdigest()
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if 'timestamp' in cached_data:
-                cache_time = datetime.fromisoformat(cached_data['timestamp'])
-                if (datetime.now() - cache_time) < timedelta(days=14):  # Extended cache
-                    logger.info(f"Using cached result for: {query}")
-                    return cached_data.get('results', [])
-        
-        # Check rate limit
-        if not self.check_rate_limit():
-            logger.warning("Rate limited, waiting...")
-            await asyncio.sleep(10)  # Ultra-aggressive: short wait
-            return []
+        # Concurrent callers for the same query wait and reuse the cached result
+        async with self._query_lock(query):
+            # Check cache first
+            cached_results = self.get_cached_results(query)
+            if cached_results is not None:
+                logger.info(f"Using cached result for: {query}")
+                return cached_results
+        
+            # Check rate limit
+            if not self.check_rate_limit():
+                logger.warning("Rate limited, waiting...")
+                await asyncio.sleep(10)  # Ultra-aggressive: short wait
+                return []
+        
+            # Initialize proxy system if needed
+            if self.use_proxies and not hasattr(self, '_proxy_initialized'):
+                self.initialize_proxy_system()
+                self._proxy_initialized = True
         
-        # Intelligent delay (except for first request)
-        if self.request_history:
-            await self.intelligent_delay()
+            # Execute search: plain HTTP first, full browser only when needed
+            results, slot_reserved = await self._try_http(query)
+            if results is None:
+                results = await self.search_with_full_protection(query, slot_reserved)
+        
+            # Cache successful results
+            if results:
+                self._store_cache(query, results)
+        
+            # Track request
+            self.request_history.append(datetime.now())
+        
+            return results
+    
+    async def search_many(self, queries: List[str], concurrency: Optional[int] = None) -> List[List[Dict]]:
+        """
+        Search many queries concurrently over one shared browser
         
-        # Initialize proxy system if needed
+        Fan-out is bounded by a global semaphore plus a per-host semaphore,
+        and each in-flight search runs in its own isolated context.
+        Results are returned in the same order as queries.
+        """
         if self.use_proxies and not hasattr(self, '_proxy_initialized'):
             self.initialize_proxy_system()
             self._proxy_initialized = True
         
-        # Execute search
-        results = await self.search_with_full_protection(query)
-        
-        # Cache successful results
-        if results:
-            self.cache[cache_key] = {
-                'results': results,
-                'timestamp': datetime.now().isoformat(),
-                'query': query,
-                'session_id': self.session_id
-            }
-            self.save_cache()
+        semaphore = asyncio.Semaphore(concurrency or self.rate_limits['max_concurrent'])
+        host_semaphore = self._host_semaphore(SEARCH_HOST)
+        
+        async def _one(query: str) -> List[Dict]:
+            self.total_requests += 1
+            async with self._query_lock(query):
+                return await _uncached(query)
+        
+        async def _uncached(query: str) -> List[Dict]:
+            cached_results = self.get_cached_results(query)
+            if cached_results is not None:
+                logger.info(f"Using cached result for: {query}")
+                return cached_results
+            
+            if not self.check_rate_limit():
+                logger.warning(f"Rate limited, skipping: {query}")
+                return []
+            
+            async with host_semaphore:
+                results, slot_reserved = await self._try_http(query)
+            if results is not None:
+                self.request_history.append(datetime.now())
+                self._store_cache(query, results)
+                return results
+            
+            start_time = time.time()
+            try:
+                async with semaphore, host_semaphore, self.acquire_context() as context:
+                    self.request_history.append(datetime.now())
+                    results = await self._search_in_ctx(context, query, slot_reserved)
+            except Exception as e:
+                await self._record_search_failure(query, e)
+                return []
+            
+            self.successful_requests += 1
+            self.failure_streak = 0
+            self.update_performance_stats(time.time() - start_time)
+            
+            if results:
+                self._store_cache(query, results)
+            return results
         
-        # Track request
-        self.request_history.append(datetime.now())
+        return await asyncio.gather(*(_one(query) for query in queries))
+    
+    def run_sync(self, coro):
+        """
+        Run a coroutine to completion on this system's own event loop
         
-        return results
+        The loop is created once and reused, so the browser, HTTP client and
+        asyncio primitives stay bound to a single loop across sync calls.
+        """
+        if self._sync_loop is None or self._sync_loop.is_closed():
+            self._sync_loop = asyncio.new_event_loop()
+        return self._sync_loop.run_until_complete(coro)
     
     def safe_search(self, query: str) -> List[Dict]:
         """Synchronous wrapper for compatibility"""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        return loop.run_until_complete(self.search(query))
+        return self.run_sync(self.search(query))
+    
+    def close(self):
+        """Synchronous shutdown; also closes the loop used by run_sync"""
+        self.run_sync(self.shutdown())
+        self._sync_loop.close()
+        self._sync_loop = None
+    
+    async def shutdown(self):
+        """Close the HTTP client and browser"""
+        if self._http is not None:
+            try:
+                await self._http.aclose()
+            except Exception as e:
+                logger.error(f"HTTP client close error: {e}")
+            self._http = None
+        if DISKCACHE_AVAILABLE:
+            self.cache.close()  # Reopens lazily if used again
+        await self.cleanup_browser()
     
     def get_session_stats(self) -> Dict[str, Any]:
         """Get comprehensive session statistics"""
@@ -721,15 +1152,9 @@ class ProductionSearchSystem:
             'cache_size': len(self.cache),
             'proxy_enabled': self.use_proxies,
             'requests_this_hour': len(self.request_history),
+            'host_rates': self.rate_limiter.get_stats(),
+            'event_loop_policy': type(asyncio.get_event_loop_policy()).__name__,
         }
-    
-    def __del__(self):
-        """Cleanup on destruction"""
-        try:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self.cleanup_browser())
-        except:
-            pass
 
 
 # Convenience wrapper that matches existing interface
@@ -738,11 +1163,12 @@ class ProductionSearchWrapper:
     Drop-in replacement for existing search systems
     """
     
-    def __init__(self, use_proxies: bool = False, paid_proxies: bool = False):
+    def __init__(self, use_proxies: bool = False, paid_proxies: bool = False, low_mem: bool = False):
         self.searcher = ProductionSearchSystem(
             headless=True,
             use_proxies=use_proxies,
-            paid_proxies=paid_proxies
+            paid_proxies=paid_proxies,
+            low_mem=low_mem
         )
     
     def safe_search(self, query: str, service: str = 'bing') -> List[Dict]:
@@ -753,26 +1179,21 @@ class ProductionSearchWrapper:
         """Compatible interface"""
         return self.searcher.safe_search(query)
     
+    def search_many(self, queries: List[str], concurrency: Optional[int] = None) -> List[List[Dict]]:
+        """Synchronous batch search, results aligned with queries"""
+        return self.searcher.run_sync(self.searcher.search_many(queries, concurrency))
+    
     def get_cached_results(self, query: str) -> Optional[List[Dict]]:
         """Check if results are cached for this query"""
-        import hashlib
-        from datetime import datetime, timedelta
-        
-        # Create the same cache key as used in safe_search
-        cache_key = hashlib.md5(f"production_{query}".encode()).hexdigest()
-        
-        if cache_key in self.searcher.cache:
-            cached_data = self.searcher.cache[cache_key]
-            if 'timestamp' in cached_data:
-                cache_time = datetime.fromisoformat(cached_data['timestamp'])
-                if (datetime.now() - cache_time) < timedelta(days=14):  # Extended cache
-                    return cached_data.get('results', [])
-        
-        return None
+        return self.searcher.get_cached_results(query)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get session statistics"""
         return self.searcher.get_session_stats()
+    
+    def close(self):
+        """Release the HTTP client, browser and event loop"""
+        self.searcher.close()
 
 
 async def test_production_system():
@@ -781,13 +1202,11 @@ async def test_production_system():
     print("=" * 40)
     
     # Test without proxies first
-    searcher = ProductionSearchSystem(
+    async with ProductionSearchSystem(
         headless=True,
         use_proxies=False,  # Set to True for proxy testing
         paid_proxies=False
-    )
-    
-    try:
+    ) as searcher:
         test_queries = ['"1220 SPIRITS"', 'Jack Daniels']
         
         for query in test_queries:
@@ -810,10 +1229,8 @@ async def test_production_system():
         print(f"\n📊 Session Statistics:")
         for key, value in stats.items():
             print(f"   {key}: {value}")
-        
-    finally:
-        await searcher.cleanup_browser()
 
 
 if __name__ == "__main__":
+    install_fast_event_loop()
     asyncio.run(test_production_system())
\ No newline at end of file
@@ -6,64 +6,228 @@ Implements advanced techniques to avoid detection and IP blocking
 
 import asyncio
 import random
+import re
 import time
 import json
 import hashlib
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 import logging
 
+# Optional fast JSON encoder for the fingerprint payload
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Vetted minimal Chromium flags; the user agent is set per context
+BROWSER_ARGS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--mute-audio',
+    '--disable-background-networking',
+    '--disable-features=Translate,MediaRouter',
+    '--disable-blink-features=AutomationControlled',
+    '--memory-pressure-off',
+    '--renderer-process-limit=2',
+)
+
+# Resource types never parsed by the scraper - aborted at the route level
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet', 'other'})
+
+# Ad/analytics hosts that only cost bandwidth and render time
+TRACKER_URL_PATTERN = re.compile(
+    r'(?:google-analytics|googletagmanager|doubleclick|googlesyndication|adservice'
+    r'|facebook\.net|hotjar|scorecardresearch|clarity\.ms|bat\.bing\.com)'
+)
+
+
+async def _route_filter(route):
+    """Abort heavy or tracking requests, let everything else through"""
+    request = route.request
+    url = request.url
+    if 'captcha' not in url and (
+        request.resource_type in BLOCKED_RESOURCE_TYPES or TRACKER_URL_PATTERN.search(url)
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Fingerprint pools - built once at import and shared read-only by every instance
+USER_AGENTS = (
+    # Windows Chrome (most common)
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    
+    # Windows Edge
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0',
+    
+    # Mac Chrome
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    
+    # Mac Safari
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Safari/605.1.15',
+    
+    # Windows Firefox
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
+)
+
+# Viewport sizes (common resolutions)
+VIEWPORTS = (
+    MappingProxyType({'width': 1920, 'height': 1080}),  # Full HD
+    MappingProxyType({'width': 1366, 'height': 768}),   # Laptop
+    MappingProxyType({'width': 1536, 'height': 864}),   # Laptop HD+
+    MappingProxyType({'width': 1440, 'height': 900}),   # MacBook
+    MappingProxyType({'width': 1600, 'height': 900}),   # Widescreen
+    MappingProxyType({'width': 2560, 'height': 1440}),  # 2K
+)
+
+# Geographic locations for variety
+LOCATIONS = (
+    MappingProxyType({'timezone_id': 'America/New_York', 'latitude': 40.7128, 'longitude': -74.0060, 'locale': 'en-US'}),
+    MappingProxyType({'timezone_id': 'America/Los_Angeles', 'latitude': 34.0522, 'longitude': -118.2437, 'locale': 'en-US'}),
+    MappingProxyType({'timezone_id': 'America/Chicago', 'latitude': 41.8781, 'longitude': -87.6298, 'locale': 'en-US'}),
+    MappingProxyType({'timezone_id': 'America/Denver', 'latitude': 39.7392, 'longitude': -104.9903, 'locale': 'en-US'}),
+    MappingProxyType({'timezone_id': 'America/Phoenix', 'latitude': 33.4484, 'longitude': -112.0740, 'locale': 'en-US'}),
+)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Compact JSON text (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+# Stealth init script body; fingerprint values, including the canvas and battery
+# noise, come from the FP object prepended at render time so every page in a
+# context reports the same fingerprint
+_STATIC_JS = """
+        // Advanced WebDriver hiding
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined,
+        });
+        
+        // Override plugins
+        Object.defineProperty(navigator, 'plugins', {
+            get: () => [
+                { name: 'Chrome PDF Plugin', description: 'Portable Document Format' },
+                { name: 'Chrome PDF Viewer', description: 'PDF Viewer' },
+                { name: 'Native Client', description: 'Native Client' },
+            ],
+        });
+        
+        // Override languages
+        Object.defineProperty(navigator, 'languages', {
+            get: () => [FP.language, 'en'],
+        });
+        
+        // Override platform
+        Object.defineProperty(navigator, 'platform', {
+            get: () => FP.platform,
+        });
+        
+        // Override hardware specs
+        Object.defineProperty(navigator, 'deviceMemory', {
+            get: () => FP.device_memory,
+        });
+        
+        Object.defineProperty(navigator, 'hardwareConcurrency', {
+            get: () => FP.hardware_concurrency,
+        });
+        
+        // Override screen properties
+        Object.defineProperty(screen, 'colorDepth', {
+            get: () => FP.color_depth,
+        });
+        
+        // Mock WebGL fingerprint
+        const getParameter = WebGLRenderingContext.prototype.getParameter;
+        WebGLRenderingContext.prototype.getParameter = function(parameter) {
+            if (parameter === 37445) {
+                return 'Intel Inc.';
+            }
+            if (parameter === 37446) {
+                return 'Intel(R) Iris(TM) Graphics 6100';
+            }
+            return getParameter.apply(this, arguments);
+        };
+        
+        // Mock canvas fingerprint
+        const canvasNoise = FP.canvas_noise;
+        const toDataURL = HTMLCanvasElement.prototype.toDataURL;
+        HTMLCanvasElement.prototype.toDataURL = function() {
+            // Add slight randomization to canvas
+            const context = this.getContext('2d');
+            if (context) {
+                context.fillStyle = 'rgba(' + canvasNoise.join(',') + ',0.01)';
+                context.fillRect(0, 0, 1, 1);
+            }
+            return toDataURL.apply(this, arguments);
+        };
+        
+        // Override permissions
+        const originalQuery = window.navigator.permissions.query;
+        window.navigator.permissions.query = (parameters) => {
+            if (parameters.name === 'notifications') {
+                return Promise.resolve({ state: Notification.permission });
+            }
+            return originalQuery(parameters);
+        };
+        
+        // Mock battery API
+        Object.defineProperty(navigator, 'getBattery', {
+            get: () => () => Promise.resolve(Object.assign({}, FP.battery)),
+        });
+        """
+
+
+def _compiled_stealth_script(fingerprint: Dict[str, Any]) -> str:
+    """Render the stealth script for one context's fingerprint (values injected as constants)"""
+    fp_json = _json_dumps({
+        'language': fingerprint['language'],
+        'platform': fingerprint['platform'],
+        'device_memory': fingerprint['device_memory'],
+        'hardware_concurrency': fingerprint['hardware_concurrency'],
+        'color_depth': fingerprint['color_depth'],
+        'canvas_noise': fingerprint['canvas_noise'],
+        'battery': fingerprint['battery'],
+    })
+    # Scoped so the helper consts never collide with page globals
+    return '(() => {\nconst FP = ' + fp_json + ';\n' + _STATIC_JS + '})();\n'
+
+
 class EnhancedStealthSystem:
     """
     Advanced anti-detection system with multiple layers of protection
     """
     
-    def __init__(self):
-        # Browser fingerprint rotation
-        self.user_agents = [
-            # Windows Chrome (most common)
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            
-            # Windows Edge
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36 Edg/119.0.0.0',
-            
-            # Mac Chrome
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            
-            # Mac Safari
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Safari/605.1.15',
-            
-            # Windows Firefox
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
-        ]
+    def __init__(self, low_mem: bool = False):
+        # Browser fingerprint rotation (shared immutable pools)
+        self.user_agents = USER_AGENTS
+        self.viewports = VIEWPORTS
+        self.locations = LOCATIONS
         
-        # Viewport sizes (common resolutions)
-        self.viewports = [
-            {'width': 1920, 'height': 1080},  # Full HD
-            {'width': 1366, 'height': 768},   # Laptop
-            {'width': 1536, 'height': 864},   # Laptop HD+
-            {'width': 1440, 'height': 900},   # MacBook
-            {'width': 1600, 'height': 900},   # Widescreen
-            {'width': 2560, 'height': 1440},  # 2K
-        ]
+        # Private RNG (seeded from os.urandom) so instances draw independent streams
+        self._rng = random.Random()
         
-        # Geographic locations for variety
-        self.locations = [
-            {'timezone_id': 'America/New_York', 'latitude': 40.7128, 'longitude': -74.0060, 'locale': 'en-US'},
-            {'timezone_id': 'America/Los_Angeles', 'latitude': 34.0522, 'longitude': -118.2437, 'locale': 'en-US'},
-            {'timezone_id': 'America/Chicago', 'latitude': 41.8781, 'longitude': -87.6298, 'locale': 'en-US'},
-            {'timezone_id': 'America/Denver', 'latitude': 39.7392, 'longitude': -104.9903, 'locale': 'en-US'},
-            {'timezone_id': 'America/Phoenix', 'latitude': 33.4484, 'longitude': -112.0740, 'locale': 'en-US'},
-        ]
+        # Fewer Chromium processes per browser (single-process when headless)
+        self.low_mem = low_mem
+        
+        # Shared Playwright driver (started once, reused for every browser launch)
+        self.playwright = None
         
         # Session tracking
         self.session_data = {}
@@ -80,9 +244,9 @@ class EnhancedStealthSystem:
         """
         Generate a random browser fingerprint
         """
-        user_agent = random.choice(self.user_agents)
-        viewport = random.choice(self.viewports)
-        location = random.choice(self.locations)
+        user_agent = self._rng.choice(self.user_agents)
+        viewport = self._rng.choice(self.viewports)
+        location = self._rng.choice(self.locations)
         
         # Determine browser type from user agent
         browser_type = 'chrome'
@@ -95,14 +259,22 @@ class EnhancedStealthSystem:
         
         return {
             'user_agent': user_agent,
-            'viewport': viewport,
-            'location': location,
+            'viewport': dict(viewport),
+            'location': dict(location),
             'browser_type': browser_type,
             'platform': 'Win32' if 'Windows' in user_agent else 'MacIntel',
             'language': location['locale'],
-            'color_depth': random.choice([24, 32]),
-            'device_memory': random.choice([4, 8, 16]),
-            'hardware_concurrency': random.choice([4, 8, 12, 16]),
+            'color_depth': self._rng.choice([24, 32]),
+            'device_memory': self._rng.choice([4, 8, 16]),
+            'hardware_concurrency': self._rng.choice([4, 8, 12, 16]),
+            # Per-context noise, fixed for every page the context opens
+            'canvas_noise': [self._rng.randint(0, 255) for _ in range(3)],
+            'battery': {
+                'charging': self._rng.random() < 0.5,
+                'chargingTime': self._rng.randint(3600, 7200),
+                'dischargingTime': self._rng.randint(14400, 28800),
+                'level': round(self._rng.uniform(0.2, 1.0), 2),
+            },
         }
     
     def get_realistic_headers(self, user_agent: str, browser_type: str) -> Dict[str, str]:
@@ -112,13 +284,13 @@ class EnhancedStealthSystem:
         base_headers = {
             'User-Agent': user_agent,
             'Accept-Encoding': 'gzip, deflate, br',
-            'Accept-Language': random.choice([
+            'Accept-Language': self._rng.choice([
                 'en-US,en;q=0.9',
                 'en-US,en;q=0.8,es;q=0.6',
                 'en-GB,en;q=0.9',
                 'en-US,en;q=0.9,fr;q=0.8',
             ]),
-            'Cache-Control': random.choice(['no-cache', 'max-age=0']),
+            'Cache-Control': self._rng.choice(['no-cache', 'max-age=0']),
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
@@ -144,12 +316,12 @@ class EnhancedStealthSystem:
             })
         
         # Randomly include/exclude some headers
-        if random.random() > 0.3:
+        if self._rng.random() > 0.3:
             base_headers['DNT'] = '1'
         
         # Add referer occasionally (looks more natural)
-        if random.random() > 0.7:
-            base_headers['Referer'] = random.choice([
+        if self._rng.random() > 0.7:
+            base_headers['Referer'] = self._rng.choice([
                 'https://www.google.com/',
                 'https://www.bing.com/',
                 'https://duckduckgo.com/',
@@ -161,150 +333,46 @@ class EnhancedStealthSystem:
         """
         Generate advanced stealth JavaScript to inject
         """
-        return f"""
-        // Advanced WebDriver hiding
-        Object.defineProperty(navigator, 'webdriver', {{
-            get: () => undefined,
-        }});
-        
-        // Override plugins
-        Object.defineProperty(navigator, 'plugins', {{
-            get: () => [
-                {{ name: 'Chrome PDF Plugin', description: 'Portable Document Format' }},
-                {{ name: 'Chrome PDF Viewer', description: 'PDF Viewer' }},
-                {{ name: 'Native Client', description: 'Native Client' }},
-            ],
-        }});
-        
-        // Override languages
-        Object.defineProperty(navigator, 'languages', {{
-            get: () => ['{fingerprint['language']}', 'en'],
-        }});
-        
-        // Override platform
-        Object.defineProperty(navigator, 'platform', {{
-            get: () => '{fingerprint['platform']}',
-        }});
-        
-        // Override hardware specs
-        Object.defineProperty(navigator, 'deviceMemory', {{
-            get: () => {fingerprint['device_memory']},
-        }});
-        
-        Object.defineProperty(navigator, 'hardwareConcurrency', {{
-            get: () => {fingerprint['hardware_concurrency']},
-        }});
-        
-        // Override screen properties
-        Object.defineProperty(screen, 'colorDepth', {{
-            get: () => {fingerprint['color_depth']},
-        }});
-        
-        // Mock WebGL fingerprint
-        const getParameter = WebGLRenderingContext.prototype.getParameter;
-        WebGLRenderingContext.prototype.getParameter = function(parameter) {{
-            if (parameter === 37445) {{
-                return 'Intel Inc.';
-            }}
-            if (parameter === 37446) {{
-                return 'Intel(R) Iris(TM) Graphics 6100';
-            }}
-            return getParameter.apply(this, arguments);
-        }};
-        
-        // Mock canvas fingerprint
-        const toDataURL = HTMLCanvasElement.prototype.toDataURL;
-        HTMLCanvasElement.prototype.toDataURL = function() {{
-            // Add slight randomization to canvas
-            const context = this.getContext('2d');
-            if (context) {{
-                context.fillStyle = 'rgba({random.randint(0,255)},{random.randint(0,255)},{random.randint(0,255)},0.01)';
-                context.fillRect(0, 0, 1, 1);
-            }}
-            return toDataURL.apply(this, arguments);
-        }};
-        
-        // Override permissions
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => {{
-            if (parameters.name === 'notifications') {{
-                return Promise.resolve({{ state: Notification.permission }});
-            }}
-            return originalQuery(parameters);
-        }};
-        
-        // Add slight timing variation
-        const originalDate = Date.now;
-        Date.now = function() {{
-            return originalDate() + Math.floor(Math.random() * 10);
-        }};
-        
-        // Mock battery API
-        Object.defineProperty(navigator, 'getBattery', {{
-            get: () => () => Promise.resolve({{
-                charging: {str(random.choice([True, False])).lower()},
-                chargingTime: {random.randint(3600, 7200)},
-                dischargingTime: {random.randint(14400, 28800)},
-                level: {round(random.uniform(0.2, 1.0), 2)},
-            }}),
-        }});
-        """
+        return _compiled_stealth_script(fingerprint)
     
     async def setup_browser_with_stealth(self, headless: bool = True) -> tuple[Browser, BrowserContext]:
         """
         Setup browser with advanced stealth configuration
         """
-        fingerprint = self.get_random_fingerprint()
-        
-        playwright = await async_playwright().start()
-        
-        # Advanced browser arguments for stealth
-        browser_args = [
-            '--no-sandbox',
-            '--disable-setuid-sandbox',
-            '--disable-dev-shm-usage',
-            '--disable-accelerated-2d-canvas',
-            '--no-first-run',
-            '--no-zygote',
-            '--disable-gpu',
-            '--disable-background-timer-throttling',
-            '--disable-backgrounding-occluded-windows',
-            '--disable-renderer-backgrounding',
-            '--disable-features=TranslateUI,VizDisplayCompositor',
-            '--disable-ipc-flooding-protection',
-            '--enable-features=NetworkService,NetworkServiceLogging',
-            '--force-color-profile=srgb',
-            '--metrics-recording-only',
-            '--use-mock-keychain',
-            '--disable-plugins-discovery',
-            '--disable-preconnect',
-            '--disable-component-extensions-with-background-pages',
-            '--disable-default-apps',
-            '--mute-audio',
-            '--disable-notifications',
-            '--disable-popup-blocking',
-            '--disable-prompt-on-repost',
-            '--disable-sync',
-            '--disable-web-security',
-            '--allow-running-insecure-content',
-            '--disable-client-side-phishing-detection',
-            '--disable-hang-monitor',
-            '--disable-logging',
-            '--disable-breakpad',
-            '--disable-crash-reporter',
-            '--no-crash-upload',
-            '--disable-background-networking',
-            '--disable-domain-reliability',
-            '--disable-features=AudioServiceOutOfProcess',
-            '--disable-features=VizDisplayCompositor',
-            f'--user-agent={fingerprint["user_agent"]}',
-        ]
+        browser = await self.launch_browser(headless=headless)
+        context = await self.new_stealth_context(browser)
+        return browser, context
+    
+    def get_browser_args(self, headless: bool = True) -> List[str]:
+        """
+        Chromium launch flags (single-process only for headless low-memory runs)
+        """
+        args = list(BROWSER_ARGS)
+        if self.low_mem and headless:
+            args.append('--single-process')
+        return args
+    
+    async def launch_browser(self, headless: bool = True) -> Browser:
+        """
+        Launch a single stealth browser that can host many isolated contexts
+        """
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        playwright = self.playwright
         
         browser = await playwright.chromium.launch(
             headless=headless,
-            args=browser_args
+            args=self.get_browser_args(headless)
         )
         
+        return browser
+    
+    async def new_stealth_context(self, browser: Browser) -> BrowserContext:
+        """
+        Create a new browser context with its own randomized fingerprint
+        """
+        fingerprint = self.get_random_fingerprint()
+        
         # Create context with randomized fingerprint
         context = await browser.new_context(
             viewport=fingerprint['viewport'],
@@ -329,37 +397,46 @@ class EnhancedStealthSystem:
         # Inject advanced stealth scripts
         await context.add_init_script(self.get_advanced_stealth_script(fingerprint))
         
-        logger.info(f"Browser setup with fingerprint: {fingerprint['browser_type']} on {fingerprint['platform']}")
+        # Skip images, fonts, media and trackers (CAPTCHA assets are exempt)
+        await self.apply_resource_blocking(context)
         
-        return browser, context
+        logger.info(f"Browser context with fingerprint: {fingerprint['browser_type']} on {fingerprint['platform']}")
+        
+        return context
+    
+    async def apply_resource_blocking(self, context: BrowserContext):
+        """
+        Abort resources the scraper never parses to cut bandwidth and render time
+        """
+        await context.route("**/*", _route_filter)
     
     def calculate_smart_delay(self, last_request_time: Optional[datetime] = None) -> float:
         """
         Calculate intelligent delay that mimics human behavior
         """
-        base_delay = random.uniform(0.5, 2.0)  # Ultra-aggressive: minimal delay  # Base delay 8-25 seconds
+        base_delay = self._rng.uniform(0.5, 2.0)  # Ultra-aggressive: minimal delay  # Base delay 8-25 seconds
         
         # Add time-based variations
         current_hour = datetime.now().hour
         
         # Slower during business hours (more human activity)
         if 9 <= current_hour <= 17:
-            base_delay *= random.uniform(1.0, 1.1)  # Ultra-aggressive: minimal penalty
+            base_delay *= self._rng.uniform(1.0, 1.1)  # Ultra-aggressive: minimal penalty
         
         # Very slow during night hours (less activity)
         elif current_hour < 6 or current_hour > 22:
-            base_delay *= random.uniform(1.0, 1.2)  # Ultra-aggressive: minimal penalty
+            base_delay *= self._rng.uniform(1.0, 1.2)  # Ultra-aggressive: minimal penalty
         
         # Add occasional very long delays (human breaks)
-        if random.random() < 0.01:  # Ultra-aggressive: rare breaks  # 10% chance
-            base_delay *= random.uniform(1.2, 2)  # Ultra-aggressive: very short breaks
+        if self._rng.random() < 0.01:  # Ultra-aggressive: rare breaks  # 10% chance
+            base_delay *= self._rng.uniform(1.2, 2)  # Ultra-aggressive: very short breaks
             logger.info(f"Taking extended break ({base_delay:.1f}s) - human behavior simulation")
         
         # Add variation based on last request time
         if last_request_time:
             time_since_last = (datetime.now() - last_request_time).total_seconds()
             if time_since_last < 30:  # Quick succession - add more delay
-                base_delay *= random.uniform(1.2, 1.6)  # Optimized: reduced succession penalty
+                base_delay *= self._rng.uniform(1.2, 1.6)  # Optimized: reduced succession penalty
         
         return base_delay
     
@@ -369,21 +446,21 @@ class EnhancedStealthSystem:
         """
         try:
             # Random mouse movements
-            if random.random() < 0.7:  # 70% chance
-                for _ in range(random.randint(1, 3)):
-                    x = random.randint(100, 1800)
-                    y = random.randint(100, 900)
+            if self._rng.random() < 0.7:  # 70% chance
+                for _ in range(self._rng.randint(1, 3)):
+                    x = self._rng.randint(100, 1800)
+                    y = self._rng.randint(100, 900)
                     await page.mouse.move(x, y)
-                    await asyncio.sleep(random.uniform(0.01, 0.1))  # Ultra-aggressive: fast movement
+                    await asyncio.sleep(self._rng.uniform(0.01, 0.1))  # Ultra-aggressive: fast movement
             
             # Random scrolling
-            if random.random() < 0.5:  # 50% chance
-                scroll_distance = random.randint(100, 800)
+            if self._rng.random() < 0.5:  # 50% chance
+                scroll_distance = self._rng.randint(100, 800)
                 await page.evaluate(f"window.scrollBy(0, {scroll_distance})")
-                await asyncio.sleep(random.uniform(0.01, 0.1))  # Ultra-aggressive: fast movement  # Ultra-aggressive: fast scroll
+                await asyncio.sleep(self._rng.uniform(0.01, 0.1))  # Ultra-aggressive: fast movement  # Ultra-aggressive: fast scroll
             
             # Random page interaction time
-            await asyncio.sleep(random.uniform(0.5, 2))  # Ultra-aggressive: fast interaction
+            await asyncio.sleep(self._rng.uniform(0.5, 2))  # Ultra-aggressive: fast interaction
             
         except Exception as e:
             logger.debug(f"Human behavior simulation error: {e}")
@@ -5,12 +5,235 @@ Improves URL identification accuracy by analyzing descriptions more thoroughly
 """
 
 import re
+import sys
+import heapq
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
 
+# Optional Aho-Corasick matcher (all terms of a table found in one pass)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Max (brand, context, domain, text) -> score entries kept across rank_urls calls
+SCORE_CACHE_SIZE = 50_000
+
+# "<brand> distillery" style suffixes that mark a producer's own name
+_FACILITY_SUFFIXES = (' distillery', ' brewery', ' winery')
+
+# Free TLDs heavily used by throwaway/spam sites
+_SUSPICIOUS_TLDS = ('.tk', '.ml', '.ga', '.cf')
+
+# Digit runs for numeric brand matching (e.g. "1220" in "1220spirits.com")
+_DIGIT_RE = re.compile(r'\d+')
+
+# Dots, hyphens etc. stripped from a domain before brand-word containment checks
+_NON_WORD_RE = re.compile(r'\W+')
+
+
+class TermTable(NamedTuple):
+    """Struct-of-arrays view of a weighted term table"""
+    terms: Tuple[str, ...]
+    weights: Tuple[float, ...]
+    automaton: Any  # Aho-Corasick automaton yielding term indices (None without pyahocorasick)
+
+
+def _build_term_table(terms: Dict[str, float]) -> TermTable:
+    """Split a term -> weight dict into parallel tuples plus an index-yielding matcher"""
+    words = tuple(sys.intern(term) for term in terms)
+    automaton = None
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for index, term in enumerate(words):
+            automaton.add_word(term, index)
+        automaton.make_automaton()
+    return TermTable(words, tuple(terms.values()), automaton)
+
+
+def _find_term_indices(table: TermTable, text: str) -> Set[int]:
+    """Indices of the table's terms that occur in text"""
+    if table.automaton is None:
+        return {index for index, term in enumerate(table.terms) if term in text}
+    return {index for _, index in table.automaton.iter(text)}
+
+
+class TermMatches(NamedTuple):
+    """Matched term indices per scoring table for one text"""
+    industry: Set[int]
+    negative: Set[int]
+    official: Set[int]
+    location: Set[int]
+
+
+def _build_master_automaton(tables: Tuple[TermTable, ...]):
+    """One automaton over several tables; payloads are (table position, term index) pairs"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    owners: Dict[str, List[Tuple[int, int]]] = {}
+    for position, table in enumerate(tables):
+        for index, term in enumerate(table.terms):
+            owners.setdefault(term, []).append((position, index))
+    automaton = ahocorasick.Automaton()
+    for term, payload in owners.items():
+        automaton.add_word(term, tuple(payload))
+    automaton.make_automaton()
+    return automaton
+
+
+def _combine_scores(domain: float, brand_match: float, industry: float,
+                    official: float, negative: float, context: float) -> float:
+    """Weighted final score from the component scores, clamped to [0, 1]"""
+    final_score = 0.0
+    final_score += domain * 0.30       # Domain analysis
+    final_score += brand_match * 0.25  # Brand name matching
+    final_score += industry * 0.20     # Industry relevance
+    final_score += official * 0.15     # Official indicators
+    final_score -= abs(negative) * 0.10  # Negative indicators reduce the score
+    final_score += context * 0.10      # Context bonus
+    return max(0.0, min(1.0, final_score))
+
+
+class ScoreComponents(NamedTuple):
+    """Per-component scores for one URL (blocked/irrelevant flag early rejections)"""
+    domain: float = 0.0
+    brand_match: float = 0.0
+    industry: float = 0.0
+    official: float = 0.0
+    negative: float = 0.0
+    context: float = 0.0
+    blocked: float = 0.0
+    irrelevant: float = 0.0
+    
+    def get(self, name: str, default: float = 0.0) -> float:
+        """Dict-style access for callers written against the old dict components"""
+        return getattr(self, name, default)
+
+
+BLOCKED_COMPONENTS = ScoreComponents(blocked=1.0)
+IRRELEVANT_COMPONENTS = ScoreComponents(irrelevant=1.0)
+
+
+@dataclass(frozen=True, slots=True)
+class BrandKey:
+    """Brand-derived values, computed once per brand instead of once per URL"""
+    name: str
+    lower: str
+    nospace: str
+    words: Tuple[str, ...]
+    significant_words: Tuple[str, ...]  # Skips short words like "A", "TO", "THE"
+    numbers: Tuple[str, ...]
+
+
+# Product-category vocabularies for class_types context matching: (label, terms)
+_WHISKEY_CONTEXT = ('🥃 Whiskey', ('whiskey', 'whisky', 'bourbon', 'scotch', 'rye', 'tennessee', 'irish'))
+_WINE_CONTEXT = ('🍷 Wine', ('wine', 'winery', 'vineyard', 'vintner', 'cellar', 'estate', 'château'))
+_BEER_CONTEXT = ('🍺 Beer', ('beer', 'brewery', 'brewing', 'ale', 'lager', 'stout', 'ipa', 'pilsner'))
+_VODKA_CONTEXT = ('🍸 Vodka', ('vodka', 'premium vodka', 'craft vodka', 'potato vodka', 'wheat vodka'))
+_GIN_CONTEXT = ('🍶 Gin', ('gin', 'dry gin', 'london gin', 'craft gin', 'botanical'))
+
+
+@dataclass(frozen=True, slots=True)
+class ContextProfile:
+    """Brand-context values derived once per rank_urls batch instead of once per URL"""
+    class_label: str = ''
+    class_terms: Tuple[str, ...] = ()
+    countries: Tuple[str, ...] = ()
+    producers: Tuple[str, ...] = ()
+    established: bool = False  # Large SKU count
+    
+    @property
+    def has_geo(self) -> bool:
+        return bool(self.countries)
+    
+    @property
+    def has_context_signal(self) -> bool:
+        return bool(self.countries or self.producers or self.established)
+
+
+EMPTY_CONTEXT_PROFILE = ContextProfile()
+
+
+def _build_context_profile(brand_context: Optional[Dict]) -> ContextProfile:
+    """Derive the per-batch ContextProfile for a brand_context dict"""
+    if not brand_context:
+        return EMPTY_CONTEXT_PROFILE
+    
+    category = ('', ())
+    if brand_context.get('class_types'):
+        class_types = ' '.join(brand_context['class_types']).lower()
+        if any(w in class_types for w in ['whiskey', 'whisky', 'bourbon', 'rye', 'scotch']):
+            category = _WHISKEY_CONTEXT
+        elif 'wine' in class_types:
+            category = _WINE_CONTEXT
+        elif any(w in class_types for w in ['beer', 'ale', 'lager', 'stout']):
+            category = _BEER_CONTEXT
+        elif 'vodka' in class_types:
+            category = _VODKA_CONTEXT
+        elif 'gin' in class_types:
+            category = _GIN_CONTEXT
+    
+    return ContextProfile(
+        class_label=category[0],
+        class_terms=category[1],
+        countries=tuple(country.lower() for country in brand_context.get('countries') or ()),
+        producers=tuple(producer.lower() for producer in brand_context.get('producers') or ()),
+        established=brand_context.get('sku_count', 0) > 10,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _build_brand_key(brand_name: str) -> BrandKey:
+    """Derive (and memoize) the BrandKey for a brand name"""
+    lower = brand_name.lower()
+    words = tuple(lower.split())
+    return BrandKey(
+        name=brand_name,
+        lower=lower,
+        nospace=lower.replace(' ', ''),
+        words=words,
+        significant_words=tuple(word for word in words if len(word) > 2),
+        numbers=tuple(_DIGIT_RE.findall(brand_name)),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _compiled_brand_patterns(brand_lower: str) -> Tuple[Tuple[re.Pattern, ...], Tuple[re.Pattern, ...]]:
+    """
+    Distillery-brand and portfolio patterns for a brand, compiled once
+
+    Callers match against already-lowercased text, so no IGNORECASE is needed.
+    """
+    brand = re.escape(brand_lower)
+    
+    # Look for patterns like "XYZ Distillery produces ABC Brand" or "ABC is made by XYZ"
+    distillery_patterns = tuple(re.compile(pattern) for pattern in (
+        rf"(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery)\s+(?:produces?|makes?|crafts?)\s+(?:the\s+)?{brand}",
+        rf"{brand}\s+(?:is\s+)?(?:made|produced|crafted|distilled|brewed)\s+(?:by|at)\s+(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery)",
+        rf"(?:from|by)\s+(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery).*{brand}",
+        rf"{brand}.*(?:from|by)\s+(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery)",
+        rf"(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery).*(?:flagship|premium|signature)\s+(?:brand\s+)?{brand}",
+    ))
+    
+    # Look for "our brands include", "portfolio includes", etc.
+    portfolio_patterns = tuple(re.compile(pattern) for pattern in (
+        rf"(?:our\s+)?(?:brands?|portfolio|products?)\s+(?:include|feature)s?\s+.*{brand}",
+        rf"{brand}\s+(?:is\s+)?(?:one\s+of\s+)?(?:our|their)\s+(?:flagship|premium|signature|main)\s+(?:brands?|products?)",
+        rf"(?:featuring|including|offering)\s+.*{brand}.*(?:vodka|whiskey|whisky|gin|rum|bourbon|spirits?)",
+        rf"(?:makers?\s+of|producers?\s+of|creators?\s+of)\s+.*{brand}",
+    ))
+    
+    return distillery_patterns, portfolio_patterns
+
 
 class EnhancedURLScorer:
     """
@@ -148,6 +371,16 @@ class EnhancedURLScorer:
             'buzzfeed.com', 'mashable.com', 'huffpost.com'
         }
         
+        # Compiled matchers for is_blocked_domain: a listed site's name label directly before a
+        # TLD or country suffix (amazon.co.uk, amazon.com.au, ebay.de, smile.amazon.com), and
+        # forum-style words anywhere in the host
+        blocked_labels = sorted({blocked.split('.', 1)[0] for blocked in self.complete_blocklist})
+        self._blocklist_re = re.compile(
+            r'(?:^|\.)(' + '|'.join(re.escape(label) for label in blocked_labels) + r')'
+            r'\.(?:(?:com|org|net|co)\.[a-z]{2}|com|org|net|[a-z]{2})$'
+        )
+        self._forum_re = re.compile(r'forum|board|discussion|community|talk')
+        
         # Official website indicators
         self.official_indicators = {
             'official website': 1.0,
@@ -179,23 +412,60 @@ class EnhancedURLScorer:
             'open hours': 0.5,
             'directions': 0.4
         }
+        
+        # Relevance vocabularies for _meets_strict_relevance_criteria, matched as substrings
+        # of "<domain> <title> <snippet>" (so plurals and run-together domains count)
+        alcohol_products = (
+            'whiskey', 'whisky', 'bourbon', 'scotch', 'rye', 'vodka', 'gin', 'rum', 'tequila',
+            'mezcal', 'brandy', 'cognac', 'wine', 'beer', 'ale', 'lager',
+            'stout', 'ipa', 'spirits', 'liquor', 'liqueur'
+        )
+        alcohol_facilities = (
+            'distillery', 'distilleries', 'distilling', 'distiller',
+            'brewery', 'breweries', 'brewing', 'brewer', 'brewhouse',
+            'winery', 'wineries', 'winemaker', 'vineyard', 'vintner'
+        )
+        self._alcohol_context_terms = alcohol_products + alcohol_facilities
+        self._facility_type_terms = alcohol_facilities + ('cellar', 'estate', 'château', 'chateau')
+        self._brand_product_terms = alcohol_products + ('tennessee',)
+        
+        # Multi-pattern matchers over the term tables above
+        self._industry_table = _build_term_table(self.industry_terms)
+        self._negative_table = _build_term_table(self.negative_indicators)
+        self._official_table = _build_term_table(self.official_indicators)
+        self._location_table = _build_term_table(self.location_indicators)
+        
+        # Master matcher: one sweep of a text finds hits for every table (TermMatches order)
+        self._term_tables = (self._industry_table, self._negative_table, self._official_table, self._location_table)
+        self._master_ac = _build_master_automaton(self._term_tables)
+        
+        # LRU cache of scores for repeated results; valid for one set of learned terms
+        self._score_cache: OrderedDict = OrderedDict()
+        self._score_cache_learned = None
+        self._score_cache_lock = threading.Lock()
     
     def is_blocked_domain(self, url: str, domain: str) -> bool:
-        """Check if domain should be completely blocked"""
+        """
+        Check if domain should be completely blocked
+        
+        Blocklisted sites match on their name label followed directly by a TLD or
+        country suffix, with any subdomain (amazon.co.uk, en.wikipedia.org). Unlike
+        the old substring check, a listed name inside a longer label or as a subdomain
+        of another site no longer blocks (bestwine.com, wine.napa.com).
+        Forum-style words still block anywhere in the host.
+        """
         domain_lower = domain.lower()
         
         # Check complete blocklist
-        for blocked in self.complete_blocklist:
-            if blocked in domain_lower:
-                logger.info(f"🚫 Blocked domain detected: {domain} (matched: {blocked})")
-                return True
+        match = self._blocklist_re.search(domain_lower)
+        if match:
+            logger.info("🚫 Blocked domain detected: %s (matched: %s)", domain, match.group(1))
+            return True
         
         # Additional pattern-based blocking
-        forum_patterns = ['forum', 'board', 'discussion', 'community', 'talk']
-        for pattern in forum_patterns:
-            if pattern in domain_lower:
-                logger.info(f"🚫 Forum domain blocked: {domain}")
-                return True
+        if self._forum_re.search(domain_lower):
+            logger.info("🚫 Forum domain blocked: %s", domain)
+            return True
                 
         return False
         
@@ -203,8 +473,8 @@ class EnhancedURLScorer:
         """Get learned relevance terms from the learning system"""
         try:
             from .learning_system import AgenticLearningSystem
-            learning_system = AgenticLearningSystem()
-            return learning_system.get_learned_relevance_terms()
+            with AgenticLearningSystem() as learning_system:
+                return learning_system.get_learned_relevance_terms()
         except Exception as e:
             logger.error(f"Error getting learned relevance terms: {e}")
             return {'products': [], 'facilities': [], 'descriptors': [], 'negative_indicators': []}
@@ -213,103 +483,83 @@ class EnhancedURLScorer:
         """Get learned negative indicators from rejected URLs"""
         try:
             from .learning_system import AgenticLearningSystem
-            learning_system = AgenticLearningSystem()
-            learned_terms = learning_system.get_learned_relevance_terms()
+            with AgenticLearningSystem() as learning_system:
+                learned_terms = learning_system.get_learned_relevance_terms()
             return learned_terms.get('negative_indicators', [])
         except Exception as e:
             logger.error(f"Error getting learned negative indicators: {e}")
             return []
     
-    def _meets_strict_relevance_criteria(self, full_text: str, domain: str, brand_name: str) -> bool:
+    def _meets_strict_relevance_criteria(self, full_text: str, domain: str, brand: BrandKey,
+                                         learned_terms: Optional[Dict[str, List[str]]] = None) -> bool:
         """
         Strict filtering: URL must have either:
         1. Brand name + alcohol product type (whiskey, vodka, etc.)
         2. Facility type (distillery, winery, brewery) - brand can be in description
         3. Exact brand name match in domain or text
         """
-        brand_lower = brand_name.lower()
+        brand_lower = brand.lower
         combined_text = f"{domain} {full_text}".lower()
         
         # Check for exact brand name match - but only if it has alcohol context
         if brand_lower in combined_text:
-            # Base alcohol-related context terms
-            alcohol_products = [
-                'whiskey', 'whisky', 'bourbon', 'scotch', 'rye', 'tennessee whiskey',
-                'irish whiskey', 'irish whisky', 'vodka', 'gin', 'rum', 'tequila', 
-                'mezcal', 'brandy', 'cognac', 'wine', 'beer', 'ale', 'lager', 
-                'stout', 'ipa', 'spirits', 'liquor', 'liqueur'
-            ]
-            
-            alcohol_facilities = [
-                'distillery', 'distilleries', 'distilling', 'distiller',
-                'brewery', 'breweries', 'brewing', 'brewer', 'brewhouse',
-                'winery', 'wineries', 'winemaker', 'vineyard', 'vintner'
-            ]
+            has_alcohol_context = self._find_relevance_term(self._alcohol_context_terms, combined_text) is not None
             
-            # ADAPTIVE LEARNING: Add learned terms from verified URLs
-            learned_terms = self._get_learned_relevance_terms()
+            # ADAPTIVE LEARNING: Add learned terms from verified URLs (may be phrases)
+            if learned_terms is None:
+                learned_terms = self._get_learned_relevance_terms()
             if learned_terms:
-                alcohol_products.extend(learned_terms['products'])
-                alcohol_facilities.extend(learned_terms['facilities'])
-                alcohol_products.extend(learned_terms['descriptors'])
-                logger.info(f"🧠 Using {len(learned_terms['products']) + len(learned_terms['facilities']) + len(learned_terms['descriptors'])} learned relevance terms")
+                learned_context = learned_terms['products'] + learned_terms['facilities'] + learned_terms['descriptors']
+                logger.info("🧠 Using %d learned relevance terms", len(learned_context))
+                if not has_alcohol_context:
+                    has_alcohol_context = any(term in combined_text for term in learned_context)
             
-            alcohol_context = alcohol_products + alcohol_facilities
-            
-            has_alcohol_context = any(term in combined_text for term in alcohol_context)
             if has_alcohol_context:
-                logger.info(f"✅ Relevance: Brand '{brand_name}' + alcohol context found")
+                logger.info("✅ Relevance: Brand '%s' + alcohol context found", brand.name)
                 return True
             else:
-                logger.info(f"❌ Brand '{brand_name}' found but no alcohol context")
+                logger.info("❌ Brand '%s' found but no alcohol context", brand.name)
         
         # Check for alcohol facility types (allow even without exact brand match)
-        facility_types = [
-            'distillery', 'distilleries', 'distilling', 'distiller',
-            'brewery', 'breweries', 'brewing', 'brewer', 'brewhouse',
-            'winery', 'wineries', 'winemaker', 'vineyard', 'vintner',
-            'cellar', 'estate', 'château', 'chateau'
-        ]
-        
-        for facility in facility_types:
-            if facility in combined_text:
-                logger.info(f"✅ Relevance: Alcohol facility '{facility}' found")
-                return True
+        facility = self._find_relevance_term(self._facility_type_terms, combined_text)
+        if facility:
+            logger.info("✅ Relevance: Alcohol facility '%s' found", facility)
+            return True
         
         # Check for brand name + alcohol product combinations
-        alcohol_products = [
-            'whiskey', 'whisky', 'bourbon', 'scotch', 'rye', 'tennessee',
-            'vodka', 'gin', 'rum', 'tequila', 'mezcal', 'brandy', 'cognac',
-            'wine', 'beer', 'ale', 'lager', 'stout', 'ipa', 'spirits',
-            'liquor', 'liqueur'
-        ]
-        
-        # Check if brand words appear near alcohol products
-        brand_words = [word for word in brand_lower.split() if len(word) > 2]
-        for brand_word in brand_words:
-            if brand_word in combined_text:
-                for product in alcohol_products:
-                    if product in combined_text:
-                        logger.info(f"✅ Relevance: Brand word '{brand_word}' + product '{product}' found")
-                        return True
+        product = self._find_relevance_term(self._brand_product_terms, combined_text)
+        if product:
+            for brand_word in brand.significant_words:
+                if brand_word in combined_text:
+                    logger.info("✅ Relevance: Brand word '%s' + product '%s' found", brand_word, product)
+                    return True
         
         # If none of the criteria are met, reject
-        logger.info(f"❌ Irrelevant: No brand+product, facility, or exact match for '{brand_name}'")
+        logger.info("❌ Irrelevant: No brand+product, facility, or exact match for '%s'", brand.name)
         return False
     
-    def score_url(self, result: Dict, brand_name: str, brand_context: Optional[Dict] = None) -> Tuple[float, Dict[str, float]]:
+    @staticmethod
+    def _find_relevance_term(terms: Tuple[str, ...], text: str) -> Optional[str]:
+        """First of terms found anywhere in text"""
+        return next((term for term in terms if term in text), None)
+    
+    def score_url(self, result: Dict, brand_name: Union[str, BrandKey], brand_context: Optional[Dict] = None,
+                  learned: Optional[Dict[str, List[str]]] = None,
+                  learned_neg: Optional[List[str]] = None) -> Tuple[float, ScoreComponents]:
         """
         Score a URL based on comprehensive analysis of all available data
         
         Args:
             result: Search result containing url, title, snippet, domain
-            brand_name: The brand being searched
+            brand_name: The brand being searched (name or prebuilt BrandKey)
             brand_context: Additional context (class_types, countries, etc.)
+            learned: Learned relevance terms (fetched per call if omitted)
+            learned_neg: Learned negative indicators (fetched per call if omitted)
             
         Returns:
             Tuple of (final_score, score_components)
         """
-        scores = {}
+        brand = brand_name if isinstance(brand_name, BrandKey) else _build_brand_key(brand_name)
         
         # Extract data
         url = result.get('url', '').lower()
@@ -319,67 +569,80 @@ class EnhancedURLScorer:
         
         # IMMEDIATE BLOCKING: Check if domain should be completely filtered out
         if self.is_blocked_domain(url, domain):
-            return 0.0, {'blocked': 1.0}
+            return 0.0, BLOCKED_COMPONENTS
         
         # Combine all text for analysis
         full_text = f"{title} {snippet}"
         
+        return self._score_text(full_text, domain, brand, _build_context_profile(brand_context), learned, learned_neg)
+    
+    def _sync_score_cache(self, learned: Dict[str, List[str]], learned_neg: List[str]):
+        """Drop cached scores when the learning system's terms have changed"""
+        stamp = (tuple((kind, tuple(terms)) for kind, terms in sorted(learned.items())), tuple(learned_neg))
+        with self._score_cache_lock:
+            if stamp != self._score_cache_learned:
+                self._score_cache.clear()
+                self._score_cache_learned = stamp
+    
+    def _cached_score_text(self, full_text: str, domain: str, brand: BrandKey, profile: ContextProfile,
+                           learned: Dict[str, List[str]], learned_neg: List[str]) -> Tuple[float, ScoreComponents]:
+        """_score_text memoized on (brand, context, domain, text)"""
+        key = (brand, profile, domain, full_text)
+        with self._score_cache_lock:
+            cached = self._score_cache.get(key)
+            if cached is not None:
+                self._score_cache.move_to_end(key)
+                return cached
+        
+        scored = self._score_text(full_text, domain, brand, profile, learned, learned_neg)
+        with self._score_cache_lock:
+            self._score_cache[key] = scored
+            if len(self._score_cache) > SCORE_CACHE_SIZE:
+                self._score_cache.popitem(last=False)
+        return scored
+    
+    def _score_text(self, full_text: str, domain: str, brand: BrandKey, profile: ContextProfile,
+                    learned: Optional[Dict[str, List[str]]],
+                    learned_neg: Optional[List[str]]) -> Tuple[float, ScoreComponents]:
+        """Score an unblocked result from its lowercased title+snippet text and domain"""
         # STRICT RELEVANCE: Must meet alcohol industry relevance criteria
-        if not self._meets_strict_relevance_criteria(full_text, domain, brand_name):
-            return 0.0, {'irrelevant': 1.0}
-        
-        # 1. Domain Analysis (30% weight)
-        scores['domain'] = self._score_domain(domain, brand_name)
-        
-        # 2. Brand Name Matching (25% weight)
-        scores['brand_match'] = self._score_brand_match(full_text, domain, brand_name)
-        
-        # 3. Industry Relevance from Snippet (20% weight)
-        scores['industry'] = self._score_industry_relevance(full_text, brand_context)
-        
-        # 4. Official Indicators (15% weight)
-        scores['official'] = self._score_official_indicators(full_text)
-        
-        # 5. Negative Indicators (10% weight penalty)
-        scores['negative'] = self._score_negative_indicators(full_text, domain)
-        
-        # 6. Context Matching (bonus up to 10%)
-        if brand_context:
-            scores['context'] = self._score_context_match(full_text, brand_context)
-        else:
-            scores['context'] = 0.0
+        if not self._meets_strict_relevance_criteria(full_text, domain, brand, learned):
+            return 0.0, IRRELEVANT_COMPONENTS
+        
+        matches = self._match_term_tables(full_text)
+        components = ScoreComponents(
+            domain=self._score_domain(domain, brand),                                   # 30% weight
+            brand_match=self._score_brand_match(full_text, domain, brand),              # 25% weight
+            industry=self._score_industry_relevance(full_text, profile, matches.industry),  # 20% weight
+            official=self._score_official_indicators(full_text, matches.official, matches.location),  # 15% weight
+            negative=self._score_negative_indicators(full_text, domain, learned_neg, matches.negative),  # 10% penalty
+            context=self._score_context_match(full_text, profile),                      # Bonus
+        )
         
         # Calculate weighted final score
-        weights = {
-            'domain': 0.30,
-            'brand_match': 0.25,
-            'industry': 0.20,
-            'official': 0.15,
-            'negative': 0.10,  # This will be subtracted
-            'context': 0.10   # Bonus
-        }
-        
-        final_score = 0.0
-        for component, weight in weights.items():
-            if component == 'negative':
-                # Negative score reduces overall score
-                final_score -= abs(scores[component]) * weight
-            else:
-                final_score += scores[component] * weight
+        final_score = _combine_scores(components.domain, components.brand_match, components.industry,
+                                      components.official, components.negative, components.context)
         
-        # Ensure score is between 0 and 1
-        final_score = max(0.0, min(1.0, final_score))
-        
-        return final_score, scores
+        return final_score, components
+    
+    def _match_term_tables(self, text: str) -> TermMatches:
+        """Term hits for all four scoring tables, in a single pass over text when possible"""
+        if self._master_ac is None:
+            return TermMatches(*(_find_term_indices(table, text) for table in self._term_tables))
+        hits = (set(), set(), set(), set())
+        for _, payload in self._master_ac.iter(text):
+            for position, index in payload:
+                hits[position].add(index)
+        return TermMatches(*hits)
     
-    def _score_domain(self, domain: str, brand_name: str) -> float:
+    def _score_domain(self, domain: str, brand: BrandKey) -> float:
         """Score domain quality and brand matching"""
         score = 0.0
         
         # Clean domain
         domain_clean = domain.replace('www.', '').lower()
-        brand_clean = brand_name.lower().replace(' ', '')
-        brand_words = [w.lower() for w in brand_name.split() if len(w) > 2]
+        brand_clean = brand.nospace
+        brand_words = brand.significant_words
         
         # Exact brand match in domain (highest score)
         if brand_clean in domain_clean.replace('.', ''):
@@ -392,8 +655,8 @@ class EnhancedURLScorer:
             score = 0.5
         
         # Numeric brand matching (e.g., "1220" in "1220spirits.com")
-        brand_numbers = re.findall(r'\d+', brand_name)
-        domain_numbers = re.findall(r'\d+', domain_clean)
+        brand_numbers = brand.numbers
+        domain_numbers = tuple(_DIGIT_RE.findall(domain_clean))
         if brand_numbers and brand_numbers == domain_numbers:
             score = max(score, 0.8)
         
@@ -402,20 +665,28 @@ class EnhancedURLScorer:
             score += 0.1
         
         # Penalty for suspicious TLDs
-        suspicious_tlds = ['.tk', '.ml', '.ga', '.cf']
-        if any(domain_clean.endswith(tld) for tld in suspicious_tlds):
+        if domain_clean.endswith(_SUSPICIOUS_TLDS):
             score -= 0.3
         
         return max(0.0, min(1.0, score))
     
-    def _score_brand_match(self, text: str, domain: str, brand_name: str) -> float:
+    def _score_brand_match(self, text: str, domain: str, brand: BrandKey) -> float:
         """Enhanced brand matching including distillery-brand relationships"""
         score = 0.0
-        brand_lower = brand_name.lower()
-        brand_words = brand_lower.split()
+        brand_lower = brand.lower
+        brand_words = brand.words
+        significant_words = brand.significant_words
+        
+        # One left-to-right scan collects every brand position
+        positions = []
+        brand_len = len(brand_lower)
+        i = text.find(brand_lower)
+        while i >= 0:
+            positions.append(i)
+            i = text.find(brand_lower, i + (brand_len or 1))
         
         # Direct brand mentions (highest priority)
-        brand_count = text.count(brand_lower)
+        brand_count = len(positions)
         if brand_count >= 3:
             score = 0.9
         elif brand_count == 2:
@@ -423,213 +694,184 @@ class EnhancedURLScorer:
         elif brand_count == 1:
             score = 0.5
         
-        # Check for brand in key positions
-        if text.startswith(brand_lower):
+        # Check for brand in key positions (checked around each hit, no rescans)
+        if positions and positions[0] == 0:
             score += 0.1
-        if f"welcome to {brand_lower}" in text:
+        if any(text.endswith('welcome to ', 0, pos) for pos in positions):
             score = 1.0
-        if f"{brand_lower} distillery" in text or f"{brand_lower} brewery" in text or f"{brand_lower} winery" in text:
+        if any(text.startswith(_FACILITY_SUFFIXES, pos + brand_len) for pos in positions):
             score = max(score, 0.9)
         
-        # ENHANCED: Distillery-Brand relationship detection
-        # Look for patterns like "XYZ Distillery produces ABC Brand" or "ABC is made by XYZ"
-        distillery_brand_patterns = [
-            rf"(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery)\s+(?:produces?|makes?|crafts?)\s+(?:the\s+)?{re.escape(brand_lower)}",
-            rf"{re.escape(brand_lower)}\s+(?:is\s+)?(?:made|produced|crafted|distilled|brewed)\s+(?:by|at)\s+(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery)",
-            rf"(?:from|by)\s+(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery).*{re.escape(brand_lower)}",
-            rf"{re.escape(brand_lower)}.*(?:from|by)\s+(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery)",
-            rf"(\w+(?:\s+\w+)*)\s+(?:distillery|brewery|winery).*(?:flagship|premium|signature)\s+(?:brand\s+)?{re.escape(brand_lower)}"
-        ]
-        
-        for pattern in distillery_brand_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                logger.info(f"🔍 Found distillery-brand relationship: {match.group(0)}")
-                score = max(score, 0.85)  # High score for detected relationships
-        
-        # ENHANCED: Product portfolio detection
-        # Look for "our brands include", "portfolio includes", etc.
-        portfolio_patterns = [
-            rf"(?:our\s+)?(?:brands?|portfolio|products?)\s+(?:include|feature)s?\s+.*{re.escape(brand_lower)}",
-            rf"{re.escape(brand_lower)}\s+(?:is\s+)?(?:one\s+of\s+)?(?:our|their)\s+(?:flagship|premium|signature|main)\s+(?:brands?|products?)",
-            rf"(?:featuring|including|offering)\s+.*{re.escape(brand_lower)}.*(?:vodka|whiskey|whisky|gin|rum|bourbon|spirits?)",
-            rf"(?:makers?\s+of|producers?\s+of|creators?\s+of)\s+.*{re.escape(brand_lower)}"
-        ]
-        
-        for pattern in portfolio_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                logger.info(f"🎯 Found brand portfolio mention: {brand_name}")
-                score = max(score, 0.8)
+        # Nothing below can raise a maxed-out score
+        if score >= 1.0:
+            return 1.0
+        
+        # Every relationship/portfolio pattern contains the full brand name, so they
+        # can only match when it occurs in the text
+        if brand_count > 0:
+            distillery_brand_patterns, portfolio_patterns = _compiled_brand_patterns(brand_lower)
+            
+            # ENHANCED: Distillery-Brand relationship detection
+            for pattern in distillery_brand_patterns:
+                match = pattern.search(text)
+                if match:
+                    logger.info("🔍 Found distillery-brand relationship: %s", match.group(0))
+                    score = max(score, 0.85)  # High score for detected relationships
+            
+            # ENHANCED: Product portfolio detection
+            for pattern in portfolio_patterns:
+                if pattern.search(text):
+                    logger.info("🎯 Found brand portfolio mention: %s", brand.name)
+                    score = max(score, 0.8)
         
         # ENHANCED: Partial word matching for compound brand names
         # If brand has multiple words, check if key words appear in context
         if len(brand_words) > 1:
-            key_words_found = 0
-            for word in brand_words:
-                if len(word) > 2:  # Skip short words like "A", "TO", "THE"
-                    if word in text:
-                        key_words_found += 1
+            key_words_found = sum(1 for word in significant_words if word in text)
             
-            if key_words_found >= len([w for w in brand_words if len(w) > 2]) * 0.7:  # 70% of key words
-                logger.info(f"🔤 Found {key_words_found} key words from brand: {brand_name}")
+            if key_words_found >= len(significant_words) * 0.7:  # 70% of key words
+                logger.info("🔤 Found %d key words from brand: %s", key_words_found, brand.name)
                 score = max(score, 0.6)
         
         # ENHANCED: Domain-text relationship bonus
         # If domain contains part of brand name and text mentions the brand
-        domain_words = re.findall(r'\w+', domain)
-        brand_in_domain = any(word in ''.join(domain_words) for word in brand_words if len(word) > 2)
+        domain_joined = _NON_WORD_RE.sub('', domain)
+        brand_in_domain = any(word in domain_joined for word in significant_words)
         if brand_in_domain and score > 0:
             score += 0.2  # Bonus for domain-text alignment
-            logger.info(f"🌐 Domain-text alignment bonus for: {brand_name}")
+            logger.info("🌐 Domain-text alignment bonus for: %s", brand.name)
         
         return min(1.0, score)
     
-    def _score_industry_relevance(self, text: str, brand_context: Optional[Dict]) -> float:
+    def _score_industry_relevance(self, text: str, profile: ContextProfile, hits: Optional[Set[int]] = None) -> float:
         """Enhanced industry relevance scoring with context awareness"""
         score = 0.0
         term_count = 0
         
         # Check for industry terms
-        for term, weight in self.industry_terms.items():
-            if term in text:
-                score += weight
-                term_count += 1
+        weights = self._industry_table.weights
+        if hits is None:
+            hits = _find_term_indices(self._industry_table, text)
+        for index in sorted(hits):
+            score += weights[index]
+            term_count += 1
         
         # Normalize by number of terms found (diminishing returns)
         if term_count > 0:
             score = score / (1 + term_count * 0.3)  # Diminishing returns factor
         
         # ENHANCED: Context-aware scoring with detailed product matching
-        if brand_context and brand_context.get('class_types'):
-            class_types = ' '.join(brand_context['class_types']).lower()
-            
-            # Specific product type matching with higher precision
-            whiskey_terms = ['whiskey', 'whisky', 'bourbon', 'scotch', 'rye', 'tennessee', 'irish']
-            wine_terms = ['wine', 'winery', 'vineyard', 'vintner', 'cellar', 'estate', 'château']
-            beer_terms = ['beer', 'brewery', 'brewing', 'ale', 'lager', 'stout', 'ipa', 'pilsner']
-            vodka_terms = ['vodka', 'premium vodka', 'craft vodka', 'potato vodka', 'wheat vodka']
-            gin_terms = ['gin', 'dry gin', 'london gin', 'craft gin', 'botanical']
-            
-            if any(w in class_types for w in ['whiskey', 'whisky', 'bourbon', 'rye', 'scotch']):
-                matches = sum(1 for term in whiskey_terms if term in text)
-                score += min(0.4, matches * 0.15)  # Up to 0.4 bonus
-                if matches > 0:
-                    logger.info(f"🥃 Whiskey context match: {matches} terms found")
-                    
-            elif 'wine' in class_types:
-                matches = sum(1 for term in wine_terms if term in text)
-                score += min(0.4, matches * 0.15)
-                if matches > 0:
-                    logger.info(f"🍷 Wine context match: {matches} terms found")
-                    
-            elif any(w in class_types for w in ['beer', 'ale', 'lager', 'stout']):
-                matches = sum(1 for term in beer_terms if term in text)
-                score += min(0.4, matches * 0.15)
-                if matches > 0:
-                    logger.info(f"🍺 Beer context match: {matches} terms found")
-                    
-            elif 'vodka' in class_types:
-                matches = sum(1 for term in vodka_terms if term in text)
-                score += min(0.4, matches * 0.15)
-                if matches > 0:
-                    logger.info(f"🍸 Vodka context match: {matches} terms found")
-                    
-            elif 'gin' in class_types:
-                matches = sum(1 for term in gin_terms if term in text)
-                score += min(0.4, matches * 0.15)
-                if matches > 0:
-                    logger.info(f"🍶 Gin context match: {matches} terms found")
+        if profile.class_terms:
+            matches = sum(1 for term in profile.class_terms if term in text)
+            score += min(0.4, matches * 0.15)  # Up to 0.4 bonus
+            if matches > 0:
+                logger.info("%s context match: %d terms found", profile.class_label, matches)
         
         # ENHANCED: Geographic context matching
-        if brand_context and brand_context.get('countries'):
-            for country in brand_context['countries']:
-                country_lower = country.lower()
+        if profile.has_geo:
+            for country_lower in profile.countries:
                 if country_lower in text:
                     score += 0.2
-                    logger.info(f"🌍 Geographic context match: {country}")
+                    logger.info("🌍 Geographic context match: %s", country_lower)
                     break
                     
                 # Check for region-specific terms
                 if country_lower in ['scotland', 'united kingdom']:
                     if any(term in text for term in ['scottish', 'highland', 'lowland', 'speyside', 'islay']):
                         score += 0.25
-                        logger.info(f"🏴󠁧󠁢󠁳󠁣󠁴󠁿 Scottish regional context found")
+                        logger.info("🏴󠁧󠁢󠁳󠁣󠁴󠁿 Scottish regional context found")
                         
                 elif country_lower == 'ireland':
                     if any(term in text for term in ['irish', 'dublin', 'cork', 'jameson']):
                         score += 0.25
-                        logger.info(f"🇮🇪 Irish regional context found")
+                        logger.info("🇮🇪 Irish regional context found")
                         
                 elif country_lower in ['united states', 'usa']:
                     if any(term in text for term in ['kentucky', 'tennessee', 'bourbon trail', 'american']):
                         score += 0.2
-                        logger.info(f"🇺🇸 American regional context found")
+                        logger.info("🇺🇸 American regional context found")
         
         return min(1.0, score)
     
-    def _score_official_indicators(self, text: str) -> float:
+    def _score_official_indicators(self, text: str, official_hits: Optional[Set[int]] = None,
+                                   location_hits: Optional[Set[int]] = None) -> float:
         """Score based on indicators of an official website"""
         score = 0.0
         
-        for indicator, weight in self.official_indicators.items():
-            if indicator in text:
-                score = max(score, weight)  # Take highest indicator
+        weights = self._official_table.weights
+        if official_hits is None:
+            official_hits = _find_term_indices(self._official_table, text)
+        for index in official_hits:
+            score = max(score, weights[index])  # Take highest indicator
         
         # Additional checks for location/visit information
-        for indicator, weight in self.location_indicators.items():
-            if indicator in text:
-                score = max(score, score + weight * 0.5)  # Add half weight as bonus
+        weights = self._location_table.weights
+        if location_hits is None:
+            location_hits = _find_term_indices(self._location_table, text)
+        for index in sorted(location_hits):
+            score = max(score, score + weights[index] * 0.5)  # Add half weight as bonus
         
         return min(1.0, score)
     
-    def _score_negative_indicators(self, text: str, domain: str) -> float:
+    def _score_negative_indicators(self, text: str, domain: str, learned_negative: Optional[List[str]] = None,
+                                   text_hits: Optional[Set[int]] = None) -> float:
         """Calculate negative score based on unwanted indicators including learned patterns"""
         negative_score = 0.0
         
         # Check built-in negative indicators
-        for indicator, weight in self.negative_indicators.items():
-            if indicator in domain:
-                negative_score = min(negative_score, weight * 1.5)  # Domain presence is worse
-            elif indicator in text:
-                negative_score = min(negative_score, weight)
+        weights = self._negative_table.weights
+        in_domain = _find_term_indices(self._negative_table, domain)
+        for index in in_domain:
+            negative_score = min(negative_score, weights[index] * 1.5)  # Domain presence is worse
+        if text_hits is None:
+            text_hits = _find_term_indices(self._negative_table, text)
+        for index in text_hits - in_domain:
+            negative_score = min(negative_score, weights[index])
         
         # REJECTION LEARNING: Check learned negative indicators from rejected URLs
-        learned_negative = self._get_learned_negative_indicators()
+        if learned_negative is None:
+            learned_negative = self._get_learned_negative_indicators()
+        text_lower = text.lower()
+        domain_lower = domain.lower()
         for negative_term in learned_negative:
-            if negative_term.lower() in text.lower() or negative_term.lower() in domain.lower():
+            term_lower = negative_term.lower()
+            hit_domain = term_lower in domain_lower
+            if hit_domain or term_lower in text_lower:
                 # Apply strong negative weight to learned patterns
-                penalty = -0.8 if negative_term.lower() in domain.lower() else -0.6
+                penalty = -0.8 if hit_domain else -0.6
                 negative_score = min(negative_score, penalty)
-                logger.info(f"🚫 Learned negative pattern detected: '{negative_term}' in {'domain' if negative_term.lower() in domain.lower() else 'text'}")
+                logger.info("🚫 Learned negative pattern detected: '%s' in %s", negative_term, 'domain' if hit_domain else 'text')
         
         return abs(negative_score)  # Return positive value for subtraction
     
-    def _score_context_match(self, text: str, brand_context: Dict) -> float:
+    def _score_context_match(self, text: str, profile: ContextProfile) -> float:
         """Score based on matching brand context"""
+        if not profile.has_context_signal:
+            return 0.0
+        
         score = 0.0
         
         # Country matching
-        if brand_context.get('countries'):
-            for country in brand_context['countries']:
-                if country.lower() in text:
-                    score += 0.3
-                    break
+        for country in profile.countries:
+            if country in text:
+                score += 0.3
+                break
         
         # Producer matching
-        if brand_context.get('producers'):
-            for producer in brand_context['producers']:
-                if producer.lower() in text:
-                    score += 0.4
-                    break
+        for producer in profile.producers:
+            if producer in text:
+                score += 0.4
+                break
         
         # SKU count indicator (established brands)
-        if brand_context.get('sku_count', 0) > 10:
+        if profile.established:
             if any(term in text for term in ['established', 'since', 'founded', 'heritage']):
                 score += 0.2
         
         return min(1.0, score)
     
-    def rank_urls(self, results: List[Dict], brand_name: str, brand_context: Optional[Dict] = None) -> List[Dict]:
+    def rank_urls(self, results: List[Dict], brand_name: str, brand_context: Optional[Dict] = None,
+                  top_n: Optional[int] = None) -> List[Dict]:
         """
         Rank a list of URLs by their scores
         
@@ -637,61 +879,80 @@ class EnhancedURLScorer:
             results: List of search results
             brand_name: The brand being searched
             brand_context: Additional context
+            top_n: Only return the best top_n results (None for all)
             
         Returns:
             List of results sorted by score with added scoring information
         """
-        scored_results = []
         blocked_count = 0
         
-        for result in results:
-            score, components = self.score_url(result, brand_name, brand_context)
-            
-            # Skip blocked domains (score = 0.0 with 'blocked' component)
-            if score == 0.0 and components.get('blocked'):
-                blocked_count += 1
-                continue
-            
-            # Add scoring information to result
-            result_with_score = result.copy()
-            result_with_score['enhanced_score'] = score
-            result_with_score['score_components'] = components
-            result_with_score['score_explanation'] = self._generate_explanation(components)
-            
-            scored_results.append(result_with_score)
+        # Brand/context-derived values and learned terms are fixed for the batch: compute them once
+        brand = _build_brand_key(brand_name)
+        profile = _build_context_profile(brand_context)
+        learned = self._get_learned_relevance_terms()
+        learned_neg = self._get_learned_negative_indicators()
+        self._sync_score_cache(learned, learned_neg)
+        
+        # Columnar pass: lowercase each field once and mask blocked domains before any scoring
+        domains = [result.get('domain', '').lower() for result in results]
+        blocked = [self.is_blocked_domain(result.get('url', '').lower(), domain)
+                   for result, domain in zip(results, domains)]
+        texts = [f"{result.get('title', '')} {result.get('snippet', '')}".lower() if not is_blocked else ''
+                 for result, is_blocked in zip(results, blocked)]
+        
+        blocked_count = sum(blocked)
+        
+        # Lazily yields (score, components, result); blocked domains are skipped
+        scored = (
+            self._cached_score_text(full_text, domain, brand, profile, learned, learned_neg) + (result,)
+            for result, domain, full_text, is_blocked in zip(results, domains, texts, blocked)
+            if not is_blocked
+        )
+        
+        # Sort by enhanced score (highest first); ties keep input order either way
+        if top_n is None:
+            ranked = sorted(scored, key=itemgetter(0), reverse=True)
+        else:
+            ranked = heapq.nlargest(top_n, scored, key=itemgetter(0))
         
         if blocked_count > 0:
             logger.info(f"🚫 Filtered out {blocked_count} blocked/forum domains")
         
-        # Sort by enhanced score (highest first)
-        scored_results.sort(key=lambda x: x['enhanced_score'], reverse=True)
+        # Add scoring information to copies of the survivors only (inputs may be shared with the search cache)
+        scored_results = []
+        for score, components, result in ranked:
+            result_with_score = result.copy()
+            result_with_score['enhanced_score'] = score
+            result_with_score['score_components'] = components._asdict()
+            result_with_score['score_explanation'] = self._generate_explanation(components)
+            scored_results.append(result_with_score)
         
         return scored_results
     
-    def _generate_explanation(self, components: Dict[str, float]) -> str:
+    def _generate_explanation(self, components: ScoreComponents) -> str:
         """Generate human-readable explanation of scoring"""
         explanations = []
         
-        if components.get('domain', 0) > 0.7:
+        if components.domain > 0.7:
             explanations.append("Strong domain match")
-        elif components.get('domain', 0) > 0.4:
+        elif components.domain > 0.4:
             explanations.append("Partial domain match")
         
-        if components.get('brand_match', 0) > 0.7:
+        if components.brand_match > 0.7:
             explanations.append("Multiple brand mentions")
         
-        if components.get('industry', 0) > 0.6:
+        if components.industry > 0.6:
             explanations.append("High industry relevance")
-        elif components.get('industry', 0) > 0.3:
+        elif components.industry > 0.3:
             explanations.append("Industry-related content")
         
-        if components.get('official', 0) > 0.7:
+        if components.official > 0.7:
             explanations.append("Official website indicators")
         
-        if components.get('negative', 0) > 0.5:
+        if components.negative > 0.5:
             explanations.append("⚠️ Contains negative indicators")
         
-        if components.get('context', 0) > 0.3:
+        if components.context > 0.3:
             explanations.append("Matches brand context")
         
         return " • ".join(explanations) if explanations else "General result"
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Helpers shared by the test modules
+"""
+
+import os
+
+# Progress output is only printed with TEST_VERBOSE=1 (or when a test module is run as a script)
+VERBOSE = os.environ.get('TEST_VERBOSE', '0') == '1'
+
+
+def set_verbose(enabled: bool = True):
+    """Turn progress output on for script runs"""
+    global VERBOSE
+    VERBOSE = enabled
+
+
+def vprint(*args, **kwargs):
+    """print() that stays quiet unless VERBOSE"""
+    if VERBOSE:
+        print(*args, **kwargs)
@@ -0,0 +1,52 @@
+"""
+Shared fixtures for the test suite
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-network", action="store_true", default=False,
+                     help="also run tests that hit live search engines")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network: test needs live network access (run with --run-network)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture(scope="session")
+def enrichment_system():
+    """One IntegratedEnrichmentSystem for the whole session (builds the searchers and scorer once)"""
+    from enrichment.orchestrator import IntegratedEnrichmentSystem
+    return IntegratedEnrichmentSystem()
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A BrandDatabase built under tmp_path, so tests never write to data/brands.db"""
+    pytest.importorskip('pandas')  # core.database needs it
+    from core.database import BrandDatabaseV2 as BrandDatabase
+    database = BrandDatabase(db_path=str(tmp_path / 'brands.db'),
+                             json_backup_path=str(tmp_path / 'brands_db.json'))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def enrichment(enrichment_system, tmp_path):
+    """The shared enrichment system with a fresh learning agent whose data lives under tmp_path"""
+    from enrichment.learning_system import AgenticLearningSystem
+    learning_agent = enrichment_system.learning_agent
+    enrichment_system.learning_agent = AgenticLearningSystem(data_dir=str(tmp_path / 'learning'))
+    yield enrichment_system
+    enrichment_system.learning_agent.close()
+    enrichment_system.learning_agent = learning_agent
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite learning events store
+"""
+
+import json
+import threading
+
+from enrichment.learning_system import AgenticLearningSystem
+
+
+def test_events_saved_once_and_reloaded(tmp_path):
+    with AgenticLearningSystem(data_dir=str(tmp_path)) as learning:
+        learning.record_user_feedback('BUFFALO TRACE', 'buffalotracedistillery.com', 0.8, 'verified', {})
+        learning.record_user_feedback('BUFFALO TRACE', 'buffalowings.com', 0.3, 'rejected', {})
+        learning._save_learning_events()
+
+    with AgenticLearningSystem(data_dir=str(tmp_path)) as reloaded:
+        assert [e.domain for e in reloaded.learning_events] == ['buffalotracedistillery.com', 'buffalowings.com']
+        assert all(e.rowid is not None for e in reloaded.learning_events)
+
+
+def test_legacy_json_imported_into_empty_db(tmp_path):
+    legacy = [{
+        'timestamp': '2024-01-01T00:00:00', 'event_type': 'verification', 'brand_name': '13 CELSIUS',
+        'domain': '13celsius.com', 'confidence_predicted': 0.6, 'user_action': 'verified',
+        'features': {}, 'metadata': {}
+    }]
+    (tmp_path / 'learning_events.json').write_text(json.dumps(legacy))
+
+    AgenticLearningSystem(data_dir=str(tmp_path)).close()
+    with AgenticLearningSystem(data_dir=str(tmp_path)) as learning:
+        assert [e.brand_name for e in learning.learning_events] == ['13 CELSIUS']
+
+
+def test_concurrent_writes_from_several_instances_are_kept(tmp_path):
+    systems = [AgenticLearningSystem(data_dir=str(tmp_path)) for _ in range(4)]
+
+    def record(learning, index):
+        for n in range(25):
+            learning.record_user_feedback(f'BRAND {index}', f'brand{index}.com', 0.5, 'verified', {'n': n})
+
+    threads = [threading.Thread(target=record, args=(s, i)) for i, s in enumerate(systems)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for learning in systems:
+        learning.close()
+
+    with AgenticLearningSystem(data_dir=str(tmp_path)) as reloaded:
+        assert len(reloaded.learning_events) == 100
+
+
+def test_close_is_idempotent_and_other_instances_keep_working(tmp_path):
+    first = AgenticLearningSystem(data_dir=str(tmp_path))
+    second = AgenticLearningSystem(data_dir=str(tmp_path))
+    first.close()
+    first.close()
+
+    second.record_user_feedback('TITO', 'titosvodka.com', 0.9, 'verified', {})
+    second.close()
+
+    with AgenticLearningSystem(data_dir=str(tmp_path)) as reloaded:
+        assert [e.domain for e in reloaded.learning_events] == ['titosvodka.com']
@@ -9,48 +9,140 @@ This script demonstrates:
 4. The effectiveness of the learning feedback loop
 """
 
+import heapq
 import json
+import mmap
+import os
+import sqlite3
+from collections import Counter, defaultdict, deque, namedtuple
 from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Keep-alive session for the local API, with a couple of quick retries
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                      max_retries=Retry(total=2, backoff_factor=0.1)))
+
+# One pass over the learning events: counts plus the last two manual inputs per brand
+LearningSummary = namedtuple('LearningSummary', [
+    'total', 'manual_count', 'automatic_count', 'manual_sources', 'brand_counts', 'brand_recent'
+])
+
+# path -> (mtime_ns, size, parsed); a file is only re-parsed after it changes
+_JSON_CACHE = {}
+
+def _load_json(path):
+    """Parse a JSON file once per modification, straight from an mmap with orjson when available"""
+    stat = os.stat(path)
+    cached = _JSON_CACHE.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    
+    if ORJSON_AVAILABLE and stat.st_size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                data = orjson.loads(view)
+    elif ORJSON_AVAILABLE:
+        data = orjson.loads(Path(path).read_bytes())
+    else:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    
+    _JSON_CACHE[path] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
+def summarize_learning_events(learning_events):
+    """Aggregate learning events without keeping them all in memory"""
+    total = 0
+    automatic_count = 0
+    manual_sources = Counter()
+    brand_counts = Counter()
+    brand_recent = defaultdict(lambda: deque(maxlen=2))
+    
+    for event in learning_events:
+        # Project the nested dicts once per event (null fields count as empty)
+        total += 1
+        features = event.get('features') or {}
+        if not features.get('manual_training'):
+            automatic_count += 1
+            continue
+        
+        metadata = event.get('metadata') or {}
+        brand = event['brand_name']
+        manual_sources[metadata.get('user_source', 'unknown')] += 1
+        brand_counts[brand] += 1
+        brand_recent[brand].append((event['domain'], features, metadata.get('notes', 'No notes')))
+    
+    return LearningSummary(total, total - automatic_count, automatic_count,
+                           manual_sources, brand_counts, brand_recent)
+
+def summarize_learning_db(path, examples=3):
+    """Build the same summary with indexed SQL aggregates over the learning events database"""
+    conn = sqlite3.connect(path)
+    try:
+        total, manual_count = conn.execute('SELECT COUNT(*), COALESCE(SUM(manual), 0) FROM events').fetchone()
+        manual_sources = Counter(dict(conn.execute(
+            'SELECT source, COUNT(*) FROM events WHERE manual = 1 GROUP BY source'
+        ).fetchall()))
+        brand_counts = Counter(dict(conn.execute(
+            'SELECT brand_name, COUNT(*) FROM events WHERE manual = 1 GROUP BY brand_name ORDER BY MIN(rowid)'
+        ).fetchall()))
+        
+        # Only the brands the examples section will show need their recent inputs
+        brand_recent = defaultdict(lambda: deque(maxlen=2))
+        for brand in [b for b, count in brand_counts.items() if count > 1][:examples]:
+            rows = conn.execute(
+                'SELECT domain, features, metadata FROM events WHERE manual = 1 AND brand_name = ? '
+                'ORDER BY rowid DESC LIMIT 2', (brand,)
+            ).fetchall()
+            for domain, features, metadata in reversed(rows):
+                notes = (json.loads(metadata) or {}).get('notes', 'No notes')
+                brand_recent[brand].append((domain, json.loads(features) or {}, notes))
+    finally:
+        conn.close()
+    
+    return LearningSummary(total, manual_count, total - manual_count,
+                           manual_sources, brand_counts, brand_recent)
+
 def load_learning_data():
-    """Load learning events and domain patterns from files"""
+    """Summarize learning events and load domain patterns from files"""
     try:
-        with open('data/learning/learning_events.json', 'r') as f:
-            learning_events = json.load(f)
+        summary = None
+        if os.path.exists('data/learning/learning_events.db'):
+            summary = summarize_learning_db('data/learning/learning_events.db')
+        if not summary or not summary.total:
+            # Not migrated yet: fall back to the legacy JSON event log
+            summary = summarize_learning_events(_load_json('data/learning/learning_events.json'))
+        domain_patterns = _load_json('data/learning/domain_patterns.json')
         
-        with open('data/learning/domain_patterns.json', 'r') as f:
-            domain_patterns = json.load(f)
-            
-        return learning_events, domain_patterns
+        return summary, domain_patterns
     except FileNotFoundError as e:
         print(f"❌ Error loading learning data: {e}")
-        return [], {}
+        return None, {}
 
-def analyze_manual_inputs(learning_events):
+def analyze_manual_inputs(summary):
     """Analyze manual training inputs vs automatic discoveries"""
-    manual_events = [e for e in learning_events if e.get('features', {}).get('manual_training')]
-    automatic_events = [e for e in learning_events if not e.get('features', {}).get('manual_training')]
-    
     print(f"📚 **Learning Events Analysis**")
-    print(f"   Total Events: {len(learning_events)}")
-    print(f"   Manual Training Events: {len(manual_events)}")
-    print(f"   Automatic Discovery Events: {len(automatic_events)}")
+    print(f"   Total Events: {summary.total}")
+    print(f"   Manual Training Events: {summary.manual_count}")
+    print(f"   Automatic Discovery Events: {summary.automatic_count}")
     print()
     
-    # Analyze manual training sources
-    manual_sources = {}
-    for event in manual_events:
-        source = event.get('metadata', {}).get('user_source', 'unknown')
-        manual_sources[source] = manual_sources.get(source, 0) + 1
-    
     print(f"📊 **Manual Input Sources:**")
-    for source, count in sorted(manual_sources.items(), key=lambda x: x[1], reverse=True):
+    for source, count in summary.manual_sources.most_common():
         print(f"   {source}: {count} entries")
     print()
-    
-    return manual_events, automatic_events
 
 def analyze_learned_patterns(domain_patterns):
     """Analyze what patterns the system has learned"""
@@ -58,16 +150,14 @@ def analyze_learned_patterns(domain_patterns):
     print(f"   Total Patterns: {len(domain_patterns)}")
     
     # Group by pattern type
-    pattern_types = {}
-    for pattern_key, pattern_data in domain_patterns.items():
-        ptype = pattern_data['pattern_type']
-        pattern_types[ptype] = pattern_types.get(ptype, [])
-        pattern_types[ptype].append(pattern_data)
+    pattern_types = defaultdict(list)
+    for pattern_data in domain_patterns.values():
+        pattern_types[pattern_data['pattern_type']].append(pattern_data)
     
     for ptype, patterns in sorted(pattern_types.items()):
         print(f"   {ptype}: {len(patterns)} patterns")
         # Show top 3 patterns for each type
-        top_patterns = sorted(patterns, key=lambda x: x['sample_count'], reverse=True)[:3]
+        top_patterns = heapq.nlargest(3, patterns, key=itemgetter('sample_count'))
         for pattern in top_patterns:
             print(f"     • '{pattern['pattern']}' - {pattern['sample_count']} samples, {pattern['success_rate']:.1%} success")
     print()
@@ -78,10 +168,11 @@ def demonstrate_learning_effectiveness():
     
     # Get learning insights from the API
     try:
-        response = requests.get('http://localhost:5000/learning_insights', 
-                              headers={'Accept': 'application/json'})
+        response = _SESSION.get('http://localhost:5000/learning_insights',
+                                headers={'Accept': 'application/json'}, timeout=(1, 3))
         if response.status_code == 200:
-            insights = response.json()['insights']
+            payload = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+            insights = payload['insights']
             
             print(f"   Success Rate: {insights['success_rate']:.1%}")
             print(f"   Total Learning Events: {insights['total_learning_events']}")
@@ -100,32 +191,19 @@ def demonstrate_learning_effectiveness():
     except Exception as e:
         print(f"   ❌ Error fetching learning insights: {e}")
 
-def show_learning_examples(learning_events):
+def show_learning_examples(summary):
     """Show specific examples of learning from manual input"""
     print(f"💡 **Learning Examples:**")
     
-    # Find interesting learning cases
-    manual_events = [e for e in learning_events if e.get('features', {}).get('manual_training')]
-    
-    # Group by brand to show learning progression
-    brand_events = {}
-    for event in manual_events:
-        brand = event['brand_name']
-        brand_events.setdefault(brand, []).append(event)
-    
-    # Show examples where multiple manual inputs helped learn patterns
+    # Show examples where multiple manual inputs helped learn patterns (brands in first-seen order)
     examples_shown = 0
-    for brand, events in brand_events.items():
-        if len(events) > 1 and examples_shown < 3:  # Show brands with multiple manual inputs
+    for brand, count in summary.brand_counts.items():
+        if count > 1 and examples_shown < 3:  # Show brands with multiple manual inputs
             print(f"   Brand: {brand}")
-            print(f"     Manual inputs: {len(events)}")
+            print(f"     Manual inputs: {count}")
             
-            # Show what was learned from each input
-            for event in events[-2:]:  # Show last 2 events
-                domain = event['domain']
-                features = event.get('features', {})
-                notes = event.get('metadata', {}).get('notes', 'No notes')
-                
+            # Show what was learned from each input (only the last 2 are kept)
+            for domain, features, notes in summary.brand_recent[brand]:
                 learned_features = [k for k, v in features.items() if v is True and k != 'manual_training']
                 print(f"     • {domain} → Learned: {', '.join(learned_features[:3])}")
                 if notes and notes != 'No notes':
@@ -146,28 +224,28 @@ def main():
     print()
     
     # Load data
-    learning_events, domain_patterns = load_learning_data()
+    summary, domain_patterns = load_learning_data()
     
-    if not learning_events:
+    if not summary or not summary.total:
         print("❌ No learning events found. The learning system may not be working properly.")
         return False
     
     # Analyze the data
-    manual_events, automatic_events = analyze_manual_inputs(learning_events)
+    analyze_manual_inputs(summary)
     analyze_learned_patterns(domain_patterns)
     demonstrate_learning_effectiveness()
-    show_learning_examples(learning_events)
+    show_learning_examples(summary)
     
     # Summary
     print("✅ **VERIFICATION SUMMARY:**")
-    print(f"   Manual inputs ARE being recorded: {len(manual_events)} events")
+    print(f"   Manual inputs ARE being recorded: {summary.manual_count} events")
     print(f"   Learning patterns ARE being created: {len(domain_patterns)} patterns")
-    print(f"   System IS improving from feedback: {len([p for p in domain_patterns.values() if p['sample_count'] > 1])} multi-sample patterns")
+    print(f"   System IS improving from feedback: {sum(1 for p in domain_patterns.values() if p['sample_count'] > 1)} multi-sample patterns")
     print()
     
     # Recommendations
     print("💡 **RECOMMENDATIONS:**")
-    if len(manual_events) < 10:
+    if summary.manual_count < 10:
         print("   • Add more manual website entries to improve learning")
     if len(domain_patterns) < 20:
         print("   • Try diverse brand types (spirits, wine, beer) for broader pattern learning")
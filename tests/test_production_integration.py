@@ -3,76 +3,119 @@
 Test the production system integration
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import pytest
 
-from brand_enrichment.integrated_enrichment import IntegratedEnrichmentSystem
+from enrichment.orchestrator import IntegratedEnrichmentSystem
+from enrichment.search_engine import ProductionSearchWrapper
+from tests._util import set_verbose, vprint
 
-def test_production_integration():
+
+# Canned production search results for '"1220 SPIRITS"'
+CANNED_RESULTS = [
+    {
+        'title': '1220 Spirits | Craft Distillery in Richmond, Virginia',
+        'snippet': '1220 Spirits is a craft distillery producing gin, whiskey and aperitivo.',
+        'url': 'https://www.1220spirits.com/',
+        'source': 'production_bing',
+    },
+    {
+        'title': '1220 Spirits - Richmond Distillery Tours',
+        'snippet': 'Visit the 1220 Spirits tasting room and distillery.',
+        'url': 'https://www.example-tours.com/1220-spirits',
+        'source': 'production_bing',
+    },
+]
+
+def test_production_integration(enrichment, monkeypatch):
     """
-    Test that the production system is properly integrated
+    Test the integration against canned search results (no network)
     """
-    print("🏭 Testing Production System Integration")
-    print("=" * 45)
+    # hybrid_search only reaches the production stack outside fast mode
+    assert not enrichment.use_fast_mode
+    assert isinstance(enrichment.browser_searcher, ProductionSearchWrapper)
+    
+    # Stub the engine's search so the wrapper and its sync loop still run
+    async def canned_search(query):
+        return [dict(r) for r in CANNED_RESULTS]
     
-    # Initialize the enrichment system
-    enrichment = IntegratedEnrichmentSystem()
+    searcher = enrichment.browser_searcher.searcher
+    monkeypatch.setattr(searcher, 'search', canned_search)
+    
+    # Simulate the counters a completed search would leave behind
+    monkeypatch.setattr(searcher, 'total_requests', 1)
+    monkeypatch.setattr(searcher, 'successful_requests', 1)
+    
+    assert check_production_integration(enrichment)
+
+@pytest.mark.network
+def test_production_integration_live(enrichment):
+    """
+    Test the integration against the live production search stack
+    """
+    assert check_production_integration(enrichment)
+
+def check_production_integration(enrichment):
+    """
+    Test that the production system is properly integrated
+    """
+    vprint("🏭 Testing Production System Integration")
+    vprint("=" * 45)
     
-    print("🔍 Testing production hybrid search...")
+    vprint("🔍 Testing production hybrid search...")
     
     # Test the hybrid search directly
     results = enrichment.hybrid_search('"1220 SPIRITS"')
     
     if results:
-        print(f"✅ SUCCESS! Found {len(results)} results with production system")
+        vprint(f"✅ SUCCESS! Found {len(results)} results with production system")
         
         # Show first result
         first = results[0]
-        print(f"📄 First result:")
-        print(f"   Title: {first['title']}")
-        print(f"   URL: {first['url']}")
-        print(f"   Source: {first['source']}")
+        vprint(f"📄 First result:")
+        vprint(f"   Title: {first['title']}")
+        vprint(f"   URL: {first['url']}")
+        vprint(f"   Source: {first['source']}")
         
         # Check if it's the official site
         if '1220' in first['title'] and 'spirits' in first['title'].lower():
-            print(f"🎯 Perfect! Found official 1220 Spirits content")
+            vprint(f"🎯 Perfect! Found official 1220 Spirits content")
         
         if 'production' in first['source']:
-            print(f"✅ Confirmed: Using production search system")
+            vprint(f"✅ Confirmed: Using production search system")
         
     else:
-        print(f"❌ No results found")
+        vprint(f"❌ No results found")
         return False
     
     # Test statistics
-    print(f"\n📊 Getting search system statistics...")
+    vprint(f"\n📊 Getting search system statistics...")
     stats = enrichment.get_search_stats()
     
     if stats:
-        print(f"✅ Statistics retrieved:")
-        print(f"   Session ID: {stats.get('session_id', 'N/A')}")
-        print(f"   Success Rate: {stats.get('success_rate', 'N/A')}")
-        print(f"   Total Requests: {stats.get('total_requests', 'N/A')}")
-        print(f"   Cache Size: {stats.get('cache_size', 'N/A')}")
-        print(f"   Proxy Enabled: {stats.get('proxy_enabled', 'N/A')}")
+        vprint(f"✅ Statistics retrieved:")
+        vprint(f"   Session ID: {stats.get('session_id', 'N/A')}")
+        vprint(f"   Success Rate: {stats.get('success_rate', 'N/A')}")
+        vprint(f"   Total Requests: {stats.get('total_requests', 'N/A')}")
+        vprint(f"   Cache Size: {stats.get('cache_size', 'N/A')}")
+        vprint(f"   Proxy Enabled: {stats.get('proxy_enabled', 'N/A')}")
     else:
-        print(f"⚠️ No statistics available")
+        vprint(f"⚠️ No statistics available")
     
-    print(f"\n🎉 Integration Test Results:")
-    print(f"✅ Production system successfully integrated")
-    print(f"✅ Enterprise anti-detection measures active")
-    print(f"✅ High-quality search results confirmed")
-    print(f"✅ Statistics and monitoring functional")
-    print(f"")
-    print(f"🚀 Your system is now production-ready!")
+    vprint(f"\n🎉 Integration Test Results:")
+    vprint(f"✅ Production system successfully integrated")
+    vprint(f"✅ Enterprise anti-detection measures active")
+    vprint(f"✅ High-quality search results confirmed")
+    vprint(f"✅ Statistics and monitoring functional")
+    vprint(f"")
+    vprint(f"🚀 Your system is now production-ready!")
     
     return True
 
 if __name__ == "__main__":
-    success = test_production_integration()
+    set_verbose()
+    success = check_production_integration(IntegratedEnrichmentSystem())
     
     if success:
-        print(f"\n🎊 SYSTEM VERIFIED! Your web enrichment system is working perfectly.")
+        vprint(f"\n🎊 SYSTEM VERIFIED! Your web enrichment system is working perfectly.")
     else:
-        print(f"\n⚠️ Integration test failed - check logs for details.")
\ No newline at end of file
+        vprint(f"\n⚠️ Integration test failed - check logs for details.")
\ No newline at end of file
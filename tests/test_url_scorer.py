@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Regression tests for EnhancedURLScorer relevance filtering and domain blocking
+"""
+
+import pytest
+
+from enrichment.url_scorer import EnhancedURLScorer, _build_brand_key
+
+# No learned terms, so results don't depend on data/learning
+NO_LEARNED_TERMS = {'products': [], 'facilities': [], 'descriptors': [], 'negative_indicators': []}
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return EnhancedURLScorer()
+
+
+def is_relevant(scorer, brand_name, title, snippet='', domain='example.com'):
+    full_text = f"{title} {snippet}".lower()
+    return scorer._meets_strict_relevance_criteria(full_text, domain, _build_brand_key(brand_name), NO_LEARNED_TERMS)
+
+
+@pytest.mark.parametrize("brand_name,title,snippet", [
+    ("OLD FORESTER", "Old Forester Whiskeys", "Explore our bourbons and ryes."),
+    ("CHATEAU MONTELENA", "Chateau Montelena Wines", "Napa Valley vineyards since 1882."),
+    ("HIGH WEST", "High West Distillers", "Award winning whiskeys from Park City."),
+    ("ANCHOR", "Anchor Brewers & Distillers", "San Francisco brewers since 1896."),
+    ("HENDRICK", "Hendrick's Gins", "Unusual gins from Scotland."),
+    ("STAG", "Stag Cellars", "Family cellars in Sonoma."),
+])
+def test_plural_product_and_facility_titles_are_relevant(scorer, brand_name, title, snippet):
+    assert is_relevant(scorer, brand_name, title, snippet)
+
+
+def test_plural_title_scores_like_singular(scorer):
+    result = {'title': 'Old Forester Whiskeys', 'snippet': 'Explore our bourbons and ryes.',
+              'domain': 'oldforester.com', 'url': 'https://oldforester.com'}
+    score, _ = scorer.score_url(result, 'OLD FORESTER', learned=NO_LEARNED_TERMS, learned_neg=[])
+    assert score == pytest.approx(0.65)
+
+
+def baseline_relevance(full_text, domain, brand_name):
+    """The original substring-based relevance check, kept as the reference behaviour"""
+    brand_lower = brand_name.lower()
+    combined_text = f"{domain} {full_text}".lower()
+    
+    if brand_lower in combined_text:
+        alcohol_context = [
+            'whiskey', 'whisky', 'bourbon', 'scotch', 'rye', 'tennessee whiskey',
+            'irish whiskey', 'irish whisky', 'vodka', 'gin', 'rum', 'tequila',
+            'mezcal', 'brandy', 'cognac', 'wine', 'beer', 'ale', 'lager',
+            'stout', 'ipa', 'spirits', 'liquor', 'liqueur',
+            'distillery', 'distilleries', 'distilling', 'distiller',
+            'brewery', 'breweries', 'brewing', 'brewer', 'brewhouse',
+            'winery', 'wineries', 'winemaker', 'vineyard', 'vintner'
+        ]
+        if any(term in combined_text for term in alcohol_context):
+            return True
+    
+    facility_types = [
+        'distillery', 'distilleries', 'distilling', 'distiller',
+        'brewery', 'breweries', 'brewing', 'brewer', 'brewhouse',
+        'winery', 'wineries', 'winemaker', 'vineyard', 'vintner',
+        'cellar', 'estate', 'château', 'chateau'
+    ]
+    if any(facility in combined_text for facility in facility_types):
+        return True
+    
+    alcohol_products = [
+        'whiskey', 'whisky', 'bourbon', 'scotch', 'rye', 'tennessee',
+        'vodka', 'gin', 'rum', 'tequila', 'mezcal', 'brandy', 'cognac',
+        'wine', 'beer', 'ale', 'lager', 'stout', 'ipa', 'spirits',
+        'liquor', 'liqueur'
+    ]
+    brand_words = [word for word in brand_lower.split() if len(word) > 2]
+    return any(brand_word in combined_text for brand_word in brand_words) and \
+        any(product in combined_text for product in alcohol_products)
+
+
+# (brand, title, snippet, domain) results where the current check must agree with the reference
+EQUIVALENCE_CORPUS = [
+    ("OLD FORESTER", "Old Forester Whiskeys", "Explore our bourbons and ryes.", "oldforester.com"),
+    ("OLD FORESTER", "Old Forester | Home", "Kentucky Straight Bourbon Whisky.", "oldforester.com"),
+    ("OLD FORESTER", "Old Forester 1920 review", "Tasting notes and score.", "whiskyreviews.net"),
+    ("BUFFALO TRACE", "Buffalo Trace Distillery", "Tours and tastings in Frankfort.", "buffalotracedistillery.com"),
+    ("BUFFALO TRACE", "Buffalo Trace - Wikipedia", "An American distillery.", "en.wikipedia.org"),
+    ("BUFFALO TRACE", "Buffalo wings near you", "Order online for delivery.", "wingstop.com"),
+    ("13 CELSIUS", "13 Celsius", "Table white wines from Italy.", "13celsius.com"),
+    ("13 CELSIUS", "13 Celsius Weather", "Today's forecast.", "weather.com"),
+    ("CHATEAU MONTELENA", "Chateau Montelena Winery", "Napa Valley winemaking since 1882.", "montelena.com"),
+    ("CHÂTEAU MARGAUX", "Château Margaux", "Premier grand cru classé.", "chateau-margaux.com"),
+    ("STAG", "Stag Cellars", "Family cellars in Sonoma.", "stagcellars.com"),
+    ("STAG", "Stag Estates", "Vineyards and tasting room.", "stagestates.com"),
+    ("ANCHOR", "Anchor Brewers & Distillers", "Steam beer and gins.", "anchorbrewing.com"),
+    ("ANCHOR", "Anchor Hardware", "Bolts, screws and anchors.", "anchorhardware.com"),
+    ("SIERRA NEVADA", "Sierra Nevada Brewing Co.", "Pale ales, IPAs and stouts.", "sierranevada.com"),
+    ("SIERRA NEVADA", "Sierra Nevada Mountains", "Hiking trails and camping.", "nps.gov"),
+    ("HENDRICK", "Hendrick's Gin", "Unusual gins from Scotland.", "hendricksgin.com"),
+    ("TITO", "Tito's Handmade Vodka", "Austin, Texas.", "titosvodka.com"),
+    ("TITO", "Tito Puente biography", "Latin jazz legend.", "biography.com"),
+    ("GREY GOOSE", "Grey Goose", "French vodka from Cognac.", "greygoose.com"),
+    ("1220 SPIRITS", "1220 Spirits", "Craft distillery in Richmond.", "1220spirits.com"),
+    ("CASA NOBLE", "Casa Noble Tequila", "Organic tequilas from Jalisco.", "casanoble.com"),
+    ("JAMESON", "Jameson Irish Whiskey", "Triple distilled.", "jamesonwhiskey.com"),
+    ("JAMESON", "Jameson Hotel", "Rooms and rates.", "jamesonhotel.com"),
+    ("CRAFT", "Craftbrewery Supplies", "Kits for home brewers.", "example.com"),
+    ("SPECTRUM", "Spectrum Solutions - Contact", "Call our team.", "example.net"),
+    ("PRINCIPAL PARTNERS", "Principal Partners", "Members forum.", "example.com"),
+]
+
+
+@pytest.mark.parametrize("brand_name,title,snippet,domain", EQUIVALENCE_CORPUS)
+def test_relevance_matches_substring_reference(scorer, brand_name, title, snippet, domain):
+    full_text = f"{title} {snippet}".lower()
+    assert is_relevant(scorer, brand_name, title, snippet, domain) == baseline_relevance(full_text, domain, brand_name)
+
+
+@pytest.mark.parametrize("domain", [
+    "amazon.com", "www.amazon.com", "smile.amazon.com",
+    "amazon.com.au", "amazon.co.uk", "amazon.ca", "ebay.de", "en.wikipedia.org", "de.wikipedia.org",
+])
+def test_blocklisted_sites_blocked_under_any_tld(scorer, domain):
+    assert scorer.is_blocked_domain(f"https://{domain}/", domain)
+
+
+@pytest.mark.parametrize("domain", [
+    "whiskytalk.com", "scotchforum.net", "winetalkboard.com", "forum.example.com", "bourbon-community.org",
+])
+def test_forum_markers_blocked_anywhere_in_domain(scorer, domain):
+    assert scorer.is_blocked_domain(f"https://{domain}/", domain)
+
+
+@pytest.mark.parametrize("domain", [
+    "buffalotracedistillery.com", "amazonian-spirits.com", "1220spirits.com",
+])
+def test_producer_domains_not_blocked(scorer, domain):
+    assert not scorer.is_blocked_domain(f"https://{domain}/", domain)
+
+
+@pytest.mark.parametrize("domain", ["bestwine.com", "mywiki.com", "supertarget.net"])
+def test_listed_name_inside_longer_label_not_blocked(scorer, domain):
+    # Intentional change from the old substring check, which blocked these as wine.com / wiki.com / target.com
+    assert not scorer.is_blocked_domain(f"https://{domain}/", domain)
+
+
+@pytest.mark.parametrize("domain", ["wiki.abc.io", "wine.napa.com", "amazon.example.org", "yelp.mybrand.co.uk"])
+def test_listed_name_as_subdomain_of_other_site_not_blocked(scorer, domain):
+    assert not scorer.is_blocked_domain(f"https://{domain}/", domain)